@@ -8,35 +8,45 @@ Usage:
     flask --app api.app run --port 5000 --debug
 """
 
-from flask import Flask
+from typing import Any
+
+import orjson
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+from config import ALLOWED_ORIGINS
+from database.db import init_db
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, used by jsonify() and request.get_json()."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Write orjson's bytes straight into the response body (no str round-trip)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS),
+            mimetype=self.mimetype,
+        )
+
 
 def create_app() -> Flask:
     """Create and configure Flask app."""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+
+    # Create or migrate the database schema (no-op when already current)
+    init_db()
 
-    # Enable CORS for frontend domains
-    import os
-    allowed_origins = [
-        "http://localhost:3000",
-        "http://127.0.0.1:5000",
-        "http://localhost:5173",
-        "http://localhost:5174",
-        "https://dashboard-production-b3df.up.railway.app",
-        "https://api-production-9507.up.railway.app",
-    ]
-
-    # Add Railway frontend domains from environment
-    dashboard_url = os.getenv("DASHBOARD_URL")
-    marketing_url = os.getenv("MARKETING_URL")
-
-    if dashboard_url:
-        allowed_origins.append(dashboard_url)
-    if marketing_url:
-        allowed_origins.append(marketing_url)
-
-    CORS(app, origins=allowed_origins, supports_credentials=True)
+    # Enable CORS for frontend domains (see ALLOWED_ORIGINS in config.py)
+    CORS(app, origins=ALLOWED_ORIGINS, supports_credentials=True)
 
     # Register blueprints
     from .routes.portfolio import portfolio_bp
@@ -3,35 +3,96 @@ Authentication API endpoints for Kite Connect and Groww.
 """
 
 import json
+import pyotp
 from flask import Blueprint, jsonify, request
 from kiteconnect import KiteConnect
 from growwapi import GrowwAPI
 
-from config import BASE_DIR
-from database.db import get_db
+from config import BASE_DIR, LEGACY_FILE_TOKENS
+from database.db import get_db, get_broker_pk
+from tools import kite as kite_module
+from tools.kite import (
+    _save_token,
+    get_kite_client,
+    get_user_access_token,
+    get_user_api_key,
+)
 from utils.jwt_auth import require_auth, get_current_user_id
 from utils.crypto import decrypt_data, encrypt_data
+from utils.cred_cache import (
+    get_cached_credential,
+    set_cached_credential,
+    invalidate_credentials,
+)
 
 auth_bp = Blueprint("auth", __name__)
 
-# Legacy token storage files (deprecated, kept for backward compatibility)
+# Legacy token storage files (deprecated, only touched when LEGACY_FILE_TOKENS is set)
 TOKEN_FILE = BASE_DIR / ".kite_token"
 PROFILE_FILE = BASE_DIR / ".kite_profile"
 
+# SQL shared by the Kite and Groww helpers below. Keeping one constant per
+# query (parameterized on the brokers.id) means each connection's sqlite3
+# statement cache only ever sees a handful of distinct statements.
+SQL_GET_BROKER_CREDENTIALS = """
+    SELECT api_key, api_secret_encrypted, totp_secret_encrypted
+    FROM broker_credentials
+    WHERE user_id = ? AND broker_id = ?
+"""
+
+SQL_GET_ACCESS_TOKEN = """
+    SELECT access_token_encrypted
+    FROM broker_credentials
+    WHERE user_id = ? AND broker_id = ?
+"""
+
+SQL_HAS_ACCESS_TOKEN = """
+    SELECT 1 FROM broker_credentials
+    WHERE user_id = ? AND broker_id = ? AND access_token_encrypted IS NOT NULL
+    LIMIT 1
+"""
+
+SQL_SAVE_ACCESS_TOKEN = """
+    UPDATE broker_credentials
+    SET access_token_encrypted = ?, status = 'authenticated',
+        broker_user_id = COALESCE(?, broker_user_id),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = ? AND broker_id = ?
+"""
+
+SQL_BACKFILL_BROKER_USER_ID = """
+    UPDATE broker_credentials
+    SET broker_user_id = ?
+    WHERE user_id = ? AND broker_id = ? AND broker_user_id IS NULL
+"""
+
+SQL_CLEAR_ACCESS_TOKEN = """
+    UPDATE broker_credentials
+    SET access_token_encrypted = NULL, status = 'configured',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = ? AND broker_id = ?
+"""
+
+SQL_CLEAR_ALL_ACCESS_TOKENS = """
+    UPDATE broker_credentials
+    SET access_token_encrypted = NULL, status = 'configured',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = ?
+"""
+
 
 def _get_user_kite_credentials(user_id: int) -> tuple[str, str] | None:
     """
     Get user's Kite API credentials from database.
     Returns (api_key, api_secret) or None if not configured.
     """
+    cached = get_cached_credential(user_id, "kite", "credentials")
+    if cached:
+        return cached
+
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT bc.api_key, bc.api_secret_encrypted
-            FROM broker_credentials bc
-            JOIN brokers b ON bc.broker_id = b.id
-            WHERE bc.user_id = ? AND b.broker_id = 'kite'
-        """, (user_id,))
+        cursor.execute(SQL_GET_BROKER_CREDENTIALS, (user_id, get_broker_pk("kite")))
 
         row = cursor.fetchone()
         if not row:
@@ -39,57 +100,48 @@ def _get_user_kite_credentials(user_id: int) -> tuple[str, str] | None:
 
         api_key = row["api_key"]
         api_secret = decrypt_data(row["api_secret_encrypted"])
-        return (api_key, api_secret)
 
+    set_cached_credential(user_id, "kite", "credentials", (api_key, api_secret))
+    return (api_key, api_secret)
 
-def _save_user_access_token(user_id: int, access_token: str) -> None:
-    """Save user's Kite access token to database."""
+
+def _save_user_access_token(
+    user_id: int,
+    access_token: str,
+    broker_user_id: str | None = None,
+) -> None:
+    """Save user's Kite access token (and Kite client ID, if known) to database."""
     encrypted_token = encrypt_data(access_token)
 
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE broker_credentials
-            SET access_token_encrypted = ?, status = 'authenticated',
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND broker_id = (
-                SELECT id FROM brokers WHERE broker_id = 'kite'
-            )
-        """, (encrypted_token, user_id))
+        cursor.execute(
+            SQL_SAVE_ACCESS_TOKEN,
+            (encrypted_token, broker_user_id, user_id, get_broker_pk("kite")),
+        )
         conn.commit()
 
+    # Seed the cache with the token we already hold in plaintext so the
+    # next request doesn't read it back and decrypt it
+    set_cached_credential(user_id, "kite", "access_token", access_token)
+
 
-def _get_user_access_token(user_id: int) -> str | None:
-    """Get user's Kite access token from database."""
+def _clear_user_access_token(user_id: int) -> None:
+    """Clear user's Kite access token from database."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT bc.access_token_encrypted
-            FROM broker_credentials bc
-            JOIN brokers b ON bc.broker_id = b.id
-            WHERE bc.user_id = ? AND b.broker_id = 'kite'
-        """, (user_id,))
-
-        row = cursor.fetchone()
-        if not row or not row["access_token_encrypted"]:
-            return None
+        cursor.execute(SQL_CLEAR_ACCESS_TOKEN, (user_id, get_broker_pk("kite")))
+        conn.commit()
 
-        return decrypt_data(row["access_token_encrypted"])
+    invalidate_credentials(user_id, "kite")
 
 
-def _clear_user_access_token(user_id: int) -> None:
-    """Clear user's Kite access token from database."""
+def _user_has_broker_token(user_id: int, broker_id: str) -> bool:
+    """Check if user has a stored access token for a broker, without decrypting it."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE broker_credentials
-            SET access_token_encrypted = NULL, status = 'configured',
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND broker_id = (
-                SELECT id FROM brokers WHERE broker_id = 'kite'
-            )
-        """, (user_id,))
-        conn.commit()
+        cursor.execute(SQL_HAS_ACCESS_TOKEN, (user_id, get_broker_pk(broker_id)))
+        return cursor.fetchone() is not None
 
 
 def _save_profile(profile_data: dict) -> None:
@@ -134,8 +186,7 @@ def get_auth_status():
         })
 
     # Check if user has Kite access token
-    access_token = _get_user_access_token(user_id)
-    broker_authenticated = access_token is not None
+    broker_authenticated = _user_has_broker_token(user_id, "kite")
 
     return jsonify({
         "success": True,
@@ -153,20 +204,17 @@ def get_login_url(user_id: int):
     Get Kite login URL for OAuth flow.
     Requires user authentication.
     """
-    # Get user's Kite credentials from database
-    credentials = _get_user_kite_credentials(user_id)
+    # Get user's Kite API key from database
+    api_key = get_user_api_key(user_id)
 
-    if not credentials:
+    if not api_key:
         return jsonify({
             "success": False,
             "error": "Kite credentials not configured. Please add your API key and secret first.",
         }), 400
 
-    api_key, _ = credentials
-
     try:
-        kite = KiteConnect(api_key=api_key)
-        login_url = kite.login_url()
+        login_url = get_kite_client(api_key).login_url()
         return jsonify({
             "success": True,
             "data": {
@@ -210,28 +258,27 @@ def handle_callback(user_id: int):
     api_key, api_secret = credentials
 
     try:
+        # generate_session() stores the new token on the client, so this one
+        # is not taken from the shared client cache
         kite = KiteConnect(api_key=api_key)
         session_data = kite.generate_session(request_token, api_secret=api_secret)
         access_token = session_data["access_token"]
 
-        # Save access token to database
-        _save_user_access_token(user_id, access_token)
-
-        # Also save to legacy file for backward compatibility
-        kite.set_access_token(access_token)
-        from tools.kite import _save_token
-        _save_token(access_token)
-
-        # Extract and save profile data (legacy)
-        profile_data = {
-            "user_id": session_data.get("user_id"),
-            "user_name": session_data.get("user_name"),
-            "user_shortname": session_data.get("user_shortname"),
-            "email": session_data.get("email"),
-            "user_type": session_data.get("user_type"),
-            "broker": session_data.get("broker", "ZERODHA"),
-        }
-        _save_profile(profile_data)
+        # Save access token and Kite client ID to database
+        _save_user_access_token(user_id, access_token, session_data.get("user_id"))
+
+        if LEGACY_FILE_TOKENS:
+            # Also save to legacy files for the CLI flow
+            _save_token(access_token)
+            profile_data = {
+                "user_id": session_data.get("user_id"),
+                "user_name": session_data.get("user_name"),
+                "user_shortname": session_data.get("user_shortname"),
+                "email": session_data.get("email"),
+                "user_type": session_data.get("user_type"),
+                "broker": session_data.get("broker", "ZERODHA"),
+            }
+            _save_profile(profile_data)
 
         return jsonify({
             "success": True,
@@ -253,7 +300,7 @@ def get_profile(user_id: int):
     Get broker (Kite) profile information for authenticated user.
     """
     # Check if user has Kite access token
-    access_token = _get_user_access_token(user_id)
+    access_token = get_user_access_token(user_id)
 
     if not access_token:
         return jsonify({
@@ -261,21 +308,17 @@ def get_profile(user_id: int):
             "error": "Kite not authenticated. Please authenticate with Kite first.",
         }), 404
 
-    # Get credentials to create Kite instance
-    credentials = _get_user_kite_credentials(user_id)
-    if not credentials:
+    # Get API key to create Kite instance
+    api_key = get_user_api_key(user_id)
+    if not api_key:
         return jsonify({
             "success": False,
             "error": "Kite credentials not found",
         }), 404
 
-    api_key, _ = credentials
-
     try:
         # Fetch profile from Kite API
-        kite = KiteConnect(api_key=api_key)
-        kite.set_access_token(access_token)
-        kite_profile = kite.profile()
+        kite_profile = get_kite_client(api_key, access_token).profile()
 
         profile_data = {
             "user_id": kite_profile.get("user_id"),
@@ -286,8 +329,17 @@ def get_profile(user_id: int):
             "broker": kite_profile.get("broker", "ZERODHA"),
         }
 
-        # Save to legacy file
-        _save_profile(profile_data)
+        if LEGACY_FILE_TOKENS:
+            _save_profile(profile_data)
+
+        # Sessions from before broker_user_id was stored have no client ID
+        # for /brokers yet; fill it in from the profile we just fetched
+        if profile_data["user_id"]:
+            with get_db() as conn:
+                conn.execute(
+                    SQL_BACKFILL_BROKER_USER_ID,
+                    (profile_data["user_id"], user_id, get_broker_pk("kite")),
+                )
 
         # Add broker connection info
         profile_data["connected_brokers"] = [
@@ -323,12 +375,11 @@ def logout(user_id: int):
         _clear_user_access_token(user_id)
 
         # Delete legacy token and profile files
-        if TOKEN_FILE.exists():
-            TOKEN_FILE.unlink()
-        _delete_profile()
+        if LEGACY_FILE_TOKENS:
+            TOKEN_FILE.unlink(missing_ok=True)
+            _delete_profile()
 
         # Clear the global kite instance
-        from tools import kite as kite_module
         kite_module._kite = None
 
         return jsonify({
@@ -355,21 +406,17 @@ def logout_all_brokers(user_id: int):
         # Clear all broker access tokens for this user
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE broker_credentials
-                SET access_token_encrypted = NULL, status = 'configured',
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = ?
-            """, (user_id,))
+            cursor.execute(SQL_CLEAR_ALL_ACCESS_TOKENS, (user_id,))
             conn.commit()
 
+        invalidate_credentials(user_id)
+
         # Delete legacy token and profile files
-        if TOKEN_FILE.exists():
-            TOKEN_FILE.unlink()
-        _delete_profile()
+        if LEGACY_FILE_TOKENS:
+            TOKEN_FILE.unlink(missing_ok=True)
+            _delete_profile()
 
         # Clear the global kite instance
-        from tools import kite as kite_module
         kite_module._kite = None
 
         return jsonify({
@@ -394,14 +441,13 @@ def _get_user_groww_credentials(user_id: int) -> tuple[str, str] | None:
     Get user's Groww API credentials from database.
     Returns (api_key, totp_secret) or None if not configured.
     """
+    cached = get_cached_credential(user_id, "groww", "credentials")
+    if cached:
+        return cached
+
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT bc.api_key, bc.totp_secret_encrypted
-            FROM broker_credentials bc
-            JOIN brokers b ON bc.broker_id = b.id
-            WHERE bc.user_id = ? AND b.broker_id = 'groww'
-        """, (user_id,))
+        cursor.execute(SQL_GET_BROKER_CREDENTIALS, (user_id, get_broker_pk("groww")))
 
         row = cursor.fetchone()
         if not row:
@@ -409,7 +455,9 @@ def _get_user_groww_credentials(user_id: int) -> tuple[str, str] | None:
 
         api_key = row["api_key"]
         totp_secret = decrypt_data(row["totp_secret_encrypted"])
-        return (api_key, totp_secret)
+
+    set_cached_credential(user_id, "groww", "credentials", (api_key, totp_secret))
+    return (api_key, totp_secret)
 
 
 def _save_user_groww_access_token(user_id: int, access_token: str) -> None:
@@ -418,49 +466,46 @@ def _save_user_groww_access_token(user_id: int, access_token: str) -> None:
 
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE broker_credentials
-            SET access_token_encrypted = ?, status = 'authenticated',
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND broker_id = (
-                SELECT id FROM brokers WHERE broker_id = 'groww'
-            )
-        """, (encrypted_token, user_id))
+        cursor.execute(
+            SQL_SAVE_ACCESS_TOKEN,
+            (encrypted_token, None, user_id, get_broker_pk("groww")),
+        )
         conn.commit()
 
+    # Seed the cache with the token we already hold in plaintext so the
+    # next request doesn't read it back and decrypt it
+    set_cached_credential(user_id, "groww", "access_token", access_token)
+
 
 def _get_user_groww_access_token(user_id: int) -> str | None:
     """Get user's Groww access token from database."""
+    cached = get_cached_credential(user_id, "groww", "access_token")
+    if cached:
+        return cached
+
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT bc.access_token_encrypted
-            FROM broker_credentials bc
-            JOIN brokers b ON bc.broker_id = b.id
-            WHERE bc.user_id = ? AND b.broker_id = 'groww'
-        """, (user_id,))
+        cursor.execute(SQL_GET_ACCESS_TOKEN, (user_id, get_broker_pk("groww")))
 
         row = cursor.fetchone()
         if not row or not row["access_token_encrypted"]:
             return None
 
-        return decrypt_data(row["access_token_encrypted"])
+        access_token = decrypt_data(row["access_token_encrypted"])
+
+    set_cached_credential(user_id, "groww", "access_token", access_token)
+    return access_token
 
 
 def _clear_user_groww_access_token(user_id: int) -> None:
     """Clear user's Groww access token from database."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE broker_credentials
-            SET access_token_encrypted = NULL, status = 'configured',
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND broker_id = (
-                SELECT id FROM brokers WHERE broker_id = 'groww'
-            )
-        """, (user_id,))
+        cursor.execute(SQL_CLEAR_ACCESS_TOKEN, (user_id, get_broker_pk("groww")))
         conn.commit()
 
+    invalidate_credentials(user_id, "groww")
+
 
 @auth_bp.route("/groww/authenticate", methods=["POST"])
 @require_auth
@@ -481,8 +526,6 @@ def authenticate_groww(user_id: int):
     api_key, totp_secret = credentials
 
     try:
-        import pyotp
-
         # Generate TOTP using the secret
         totp_gen = pyotp.TOTP(totp_secret)
         totp = totp_gen.now()
@@ -4,12 +4,65 @@ Broker credentials management API endpoints.
 
 from flask import Blueprint, jsonify, request
 
-from database.db import get_db
+from database.db import get_db, get_broker_pk
 from utils.jwt_auth import require_auth
 from utils.crypto import encrypt_data, decrypt_data
+from utils.cred_cache import invalidate_credentials
 
 brokers_bp = Blueprint("brokers", __name__)
 
+SQL_LIST_BROKERS = """
+    SELECT
+        b.id,
+        b.name,
+        b.broker_id,
+        b.oauth_enabled,
+        CASE
+            WHEN bc.id IS NULL THEN 'unconfigured'
+            ELSE bc.status
+        END as status,
+        CASE
+            WHEN bc.id IS NOT NULL THEN 1
+            ELSE 0
+        END as has_credentials,
+        bc.broker_user_id
+    FROM brokers b
+    LEFT JOIN broker_credentials bc
+        ON b.id = bc.broker_id AND bc.user_id = ?
+    ORDER BY b.name
+"""
+
+SQL_GET_CREDENTIALS_STATUS = """
+    SELECT id, status, created_at, updated_at
+    FROM broker_credentials
+    WHERE user_id = ? AND broker_id = ?
+"""
+
+SQL_UPSERT_GROWW_CREDENTIALS = """
+    INSERT INTO broker_credentials
+    (user_id, broker_id, api_key, totp_secret_encrypted, status)
+    VALUES (?, ?, ?, ?, 'configured')
+    ON CONFLICT(user_id, broker_id) DO UPDATE SET
+        api_key = excluded.api_key,
+        totp_secret_encrypted = excluded.totp_secret_encrypted,
+        status = 'configured', updated_at = CURRENT_TIMESTAMP
+"""
+
+SQL_UPSERT_CREDENTIALS = """
+    INSERT INTO broker_credentials
+    (user_id, broker_id, api_key, api_secret_encrypted, status)
+    VALUES (?, ?, ?, ?, 'configured')
+    ON CONFLICT(user_id, broker_id) DO UPDATE SET
+        api_key = excluded.api_key,
+        api_secret_encrypted = excluded.api_secret_encrypted,
+        status = 'configured', updated_at = CURRENT_TIMESTAMP
+"""
+
+SQL_DELETE_CREDENTIALS = """
+    DELETE FROM broker_credentials
+    WHERE user_id = ? AND broker_id = ?
+"""
+
 
 @brokers_bp.route("/brokers", methods=["GET"])
 @require_auth
@@ -17,48 +70,28 @@ def get_brokers(user_id: int):
     """
     Get list of all available brokers with user's configuration status.
     """
-    # Get broker user_id from profile if authenticated
-    from api.routes.auth import _load_profile
-    profile = _load_profile()
-    broker_user_id = profile.get("user_id") if profile else None
-
     with get_db() as conn:
         cursor = conn.cursor()
+        # Plain tuples are cheaper to unpack than sqlite3.Row lookups by name
+        cursor.row_factory = None
 
         # Get all brokers with user's credential status
-        cursor.execute("""
-            SELECT
-                b.id,
-                b.name,
-                b.broker_id,
-                b.oauth_enabled,
-                CASE
-                    WHEN bc.id IS NULL THEN 'unconfigured'
-                    ELSE bc.status
-                END as status,
-                CASE
-                    WHEN bc.id IS NOT NULL THEN 1
-                    ELSE 0
-                END as has_credentials
-            FROM brokers b
-            LEFT JOIN broker_credentials bc
-                ON b.id = bc.broker_id AND bc.user_id = ?
-            ORDER BY b.name
-        """, (user_id,))
+        cursor.execute(SQL_LIST_BROKERS, (user_id,))
 
         brokers = []
-        for row in cursor.fetchall():
+        for (pk, name, broker_id, oauth_enabled, status,
+             has_credentials, broker_user_id) in cursor.fetchall():
             broker_data = {
-                "id": row["id"],
-                "name": row["name"],
-                "broker_id": row["broker_id"],
-                "oauth_enabled": bool(row["oauth_enabled"]),
-                "status": row["status"],
-                "has_credentials": bool(row["has_credentials"]),
+                "id": pk,
+                "name": name,
+                "broker_id": broker_id,
+                "oauth_enabled": bool(oauth_enabled),
+                "status": status,
+                "has_credentials": bool(has_credentials),
             }
 
             # Add broker user_id if authenticated
-            if row["status"] == "authenticated" and broker_user_id:
+            if status == "authenticated" and broker_user_id:
                 broker_data["user_id"] = broker_user_id
 
             brokers.append(broker_data)
@@ -78,25 +111,18 @@ def get_broker_credentials_status(user_id: int, broker_id: str):
     Check if user has configured credentials for a broker.
     Does not return actual credentials, just status.
     """
+    broker_pk = get_broker_pk(broker_id)
+    if broker_pk is None:
+        return jsonify({
+            "success": False,
+            "error": "Broker not found",
+        }), 404
+
     with get_db() as conn:
         cursor = conn.cursor()
 
-        # Get broker
-        cursor.execute("SELECT id, name FROM brokers WHERE broker_id = ?", (broker_id,))
-        broker = cursor.fetchone()
-
-        if not broker:
-            return jsonify({
-                "success": False,
-                "error": "Broker not found",
-            }), 404
-
         # Check if user has credentials
-        cursor.execute("""
-            SELECT id, status, created_at, updated_at
-            FROM broker_credentials
-            WHERE user_id = ? AND broker_id = ?
-        """, (user_id, broker["id"]))
+        cursor.execute(SQL_GET_CREDENTIALS_STATUS, (user_id, broker_pk))
 
         creds = cursor.fetchone()
 
@@ -146,6 +172,13 @@ def save_broker_credentials(user_id: int, broker_id: str):
             "error": "api_key and api_secret cannot be empty",
         }), 400
 
+    broker_pk = get_broker_pk(broker_id)
+    if broker_pk is None:
+        return jsonify({
+            "success": False,
+            "error": "Broker not found",
+        }), 404
+
     try:
         # Encrypt the secret
         encrypted_secret = encrypt_data(api_secret)
@@ -153,59 +186,17 @@ def save_broker_credentials(user_id: int, broker_id: str):
         with get_db() as conn:
             cursor = conn.cursor()
 
-            # Get broker ID
-            cursor.execute("SELECT id FROM brokers WHERE broker_id = ?", (broker_id,))
-            broker = cursor.fetchone()
-
-            if not broker:
-                return jsonify({
-                    "success": False,
-                    "error": "Broker not found",
-                }), 404
-
-            # Check if credentials already exist
-            cursor.execute("""
-                SELECT id FROM broker_credentials
-                WHERE user_id = ? AND broker_id = ?
-            """, (user_id, broker["id"]))
-
-            existing = cursor.fetchone()
-
-            if existing:
-                # Update existing credentials
-                # For Groww, store in totp_secret_encrypted, for others use api_secret_encrypted
-                if broker_id == 'groww':
-                    cursor.execute("""
-                        UPDATE broker_credentials
-                        SET api_key = ?, totp_secret_encrypted = ?,
-                            status = 'configured', updated_at = CURRENT_TIMESTAMP
-                        WHERE user_id = ? AND broker_id = ?
-                    """, (api_key, encrypted_secret, user_id, broker["id"]))
-                else:
-                    cursor.execute("""
-                        UPDATE broker_credentials
-                        SET api_key = ?, api_secret_encrypted = ?,
-                            status = 'configured', updated_at = CURRENT_TIMESTAMP
-                        WHERE user_id = ? AND broker_id = ?
-                    """, (api_key, encrypted_secret, user_id, broker["id"]))
+            # Insert or update credentials in one statement
+            # For Groww, store in totp_secret_encrypted, for others use api_secret_encrypted
+            if broker_id == 'groww':
+                cursor.execute(SQL_UPSERT_GROWW_CREDENTIALS, (user_id, broker_pk, api_key, encrypted_secret))
             else:
-                # Insert new credentials
-                # For Groww, store in totp_secret_encrypted, for others use api_secret_encrypted
-                if broker_id == 'groww':
-                    cursor.execute("""
-                        INSERT INTO broker_credentials
-                        (user_id, broker_id, api_key, totp_secret_encrypted, status)
-                        VALUES (?, ?, ?, ?, 'configured')
-                    """, (user_id, broker["id"], api_key, encrypted_secret))
-                else:
-                    cursor.execute("""
-                        INSERT INTO broker_credentials
-                        (user_id, broker_id, api_key, api_secret_encrypted, status)
-                        VALUES (?, ?, ?, ?, 'configured')
-                    """, (user_id, broker["id"], api_key, encrypted_secret))
+                cursor.execute(SQL_UPSERT_CREDENTIALS, (user_id, broker_pk, api_key, encrypted_secret))
 
             conn.commit()
 
+        invalidate_credentials(user_id, broker_id)
+
         return jsonify({
             "success": True,
             "data": {
@@ -227,24 +218,18 @@ def delete_broker_credentials(user_id: int, broker_id: str):
     """
     Delete broker credentials for user.
     """
+    broker_pk = get_broker_pk(broker_id)
+    if broker_pk is None:
+        return jsonify({
+            "success": False,
+            "error": "Broker not found",
+        }), 404
+
     with get_db() as conn:
         cursor = conn.cursor()
 
-        # Get broker ID
-        cursor.execute("SELECT id FROM brokers WHERE broker_id = ?", (broker_id,))
-        broker = cursor.fetchone()
-
-        if not broker:
-            return jsonify({
-                "success": False,
-                "error": "Broker not found",
-            }), 404
-
         # Delete credentials
-        cursor.execute("""
-            DELETE FROM broker_credentials
-            WHERE user_id = ? AND broker_id = ?
-        """, (user_id, broker["id"]))
+        cursor.execute(SQL_DELETE_CREDENTIALS, (user_id, broker_pk))
 
         if cursor.rowcount == 0:
             return jsonify({
@@ -254,6 +239,8 @@ def delete_broker_credentials(user_id: int, broker_id: str):
 
         conn.commit()
 
+    invalidate_credentials(user_id, broker_id)
+
     return jsonify({
         "success": True,
         "data": {
@@ -2,10 +2,15 @@
 Google OAuth authentication API endpoints.
 """
 
+import json
 import os
+import orjson
 import requests
 from flask import Blueprint, jsonify, request, make_response
+from requests.adapters import HTTPAdapter
+from string import Template
 from urllib.parse import urlencode
+from urllib3.util.retry import Retry
 
 from database.db import get_db
 from utils.jwt_auth import create_token, get_current_user_id
@@ -22,6 +27,64 @@ GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 
+# Shared HTTP session so logins reuse pooled TLS connections to Google.
+# Retry only covers idempotent requests by default, so the single-use
+# authorization code is never POSTed twice.
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+))
+
+# Popup pages returned by the OAuth callback. They post the result to the
+# opener window and close. Parsed once at import; values are filled in with
+# _script_literal() so they can't break out of the <script> block.
+_AUTH_SUCCESS_HTML = Template("""
+        <html>
+            <body>
+                <script>
+                    window.opener.postMessage($message, $target_origin);
+                    window.close();
+                </script>
+                <p>Authentication successful! This window will close automatically...</p>
+            </body>
+        </html>
+        """)
+
+_AUTH_ERROR_HTML = Template("""
+        <html>
+            <body>
+                <script>
+                    window.opener.postMessage($message, $target_origin);
+                    window.close();
+                </script>
+            </body>
+        </html>
+        """)
+
+
+def _script_literal(value: object) -> str:
+    """
+    Encode a value as a JavaScript literal that is safe inside a <script> tag.
+    JSON handles quoting; escaping <, > and & prevents "</script>" and HTML
+    comment sequences from ending the script early.
+    """
+    return (
+        json.dumps(value)
+        .replace("<", "\\u003c")
+        .replace(">", "\\u003e")
+        .replace("&", "\\u0026")
+    )
+
+
+def _auth_popup_html(template: Template, message: dict) -> str:
+    """Render an OAuth popup page that posts message to FRONTEND_URL."""
+    return template.substitute(
+        message=_script_literal(message),
+        target_origin=_script_literal(FRONTEND_URL),
+    )
+
 
 def get_redirect_uri() -> str:
     """
@@ -80,16 +143,7 @@ def google_callback():
 
     if error:
         # Redirect to frontend with error
-        return f"""
-        <html>
-            <body>
-                <script>
-                    window.opener.postMessage({{ type: 'GOOGLE_AUTH_ERROR', error: '{error}' }}, '{FRONTEND_URL}');
-                    window.close();
-                </script>
-            </body>
-        </html>
-        """
+        return _auth_popup_html(_AUTH_ERROR_HTML, {"type": "GOOGLE_AUTH_ERROR", "error": error})
 
     if not code:
         return jsonify({
@@ -107,9 +161,9 @@ def google_callback():
             "grant_type": "authorization_code",
         }
 
-        token_response = requests.post(GOOGLE_TOKEN_URL, data=token_data)
+        token_response = _http.post(GOOGLE_TOKEN_URL, data=token_data, timeout=10)
         token_response.raise_for_status()
-        tokens = token_response.json()
+        tokens = orjson.loads(token_response.content)
 
         access_token = tokens.get("access_token")
         if not access_token:
@@ -117,9 +171,9 @@ def google_callback():
 
         # Get user info from Google
         headers = {"Authorization": f"Bearer {access_token}"}
-        userinfo_response = requests.get(GOOGLE_USERINFO_URL, headers=headers)
+        userinfo_response = _http.get(GOOGLE_USERINFO_URL, headers=headers, timeout=10)
         userinfo_response.raise_for_status()
-        user_info = userinfo_response.json()
+        user_info = orjson.loads(userinfo_response.content)
 
         google_id = user_info.get("id")
         email = user_info.get("email")
@@ -129,29 +183,21 @@ def google_callback():
         if not google_id or not email:
             raise Exception("Invalid user info from Google")
 
-        # Create or update user in database
+        # Create or update user in database in one statement
+        # (RETURNING requires SQLite 3.35+)
         with get_db() as conn:
             cursor = conn.cursor()
-
-            # Check if user exists
-            cursor.execute("SELECT id FROM users WHERE google_id = ?", (google_id,))
-            existing_user = cursor.fetchone()
-
-            if existing_user:
-                # Update existing user
-                user_id = existing_user["id"]
-                cursor.execute("""
-                    UPDATE users
-                    SET email = ?, name = ?, profile_picture = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (email, name, picture, user_id))
-            else:
-                # Create new user
-                cursor.execute("""
-                    INSERT INTO users (google_id, email, name, profile_picture)
-                    VALUES (?, ?, ?, ?)
-                """, (google_id, email, name, picture))
-                user_id = cursor.lastrowid
+            cursor.execute("""
+                INSERT INTO users (google_id, email, name, profile_picture)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(google_id) DO UPDATE SET
+                    email = excluded.email,
+                    name = excluded.name,
+                    profile_picture = excluded.profile_picture,
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING id
+            """, (google_id, email, name, picture))
+            user_id = cursor.fetchone()["id"]
 
             conn.commit()
 
@@ -160,20 +206,10 @@ def google_callback():
 
         # Redirect to frontend with token
         # Use postMessage to send token to opener window, then close popup
-        response_html = f"""
-        <html>
-            <body>
-                <script>
-                    window.opener.postMessage({{
-                        type: 'GOOGLE_AUTH_SUCCESS',
-                        token: '{jwt_token}'
-                    }}, '{FRONTEND_URL}');
-                    window.close();
-                </script>
-                <p>Authentication successful! This window will close automatically...</p>
-            </body>
-        </html>
-        """
+        response_html = _auth_popup_html(
+            _AUTH_SUCCESS_HTML,
+            {"type": "GOOGLE_AUTH_SUCCESS", "token": jwt_token},
+        )
 
         response = make_response(response_html)
         # Also set as httpOnly cookie for security
@@ -191,19 +227,7 @@ def google_callback():
 
     except Exception as e:
         error_msg = str(e)
-        return f"""
-        <html>
-            <body>
-                <script>
-                    window.opener.postMessage({{
-                        type: 'GOOGLE_AUTH_ERROR',
-                        error: '{error_msg}'
-                    }}, '{FRONTEND_URL}');
-                    window.close();
-                </script>
-            </body>
-        </html>
-        """
+        return _auth_popup_html(_AUTH_ERROR_HTML, {"type": "GOOGLE_AUTH_ERROR", "error": error_msg})
 
 
 @google_auth_bp.route("/me", methods=["GET"])
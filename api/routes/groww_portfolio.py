@@ -9,6 +9,13 @@ from utils.jwt_auth import require_auth
 
 groww_portfolio_bp = Blueprint("groww_portfolio", __name__)
 
+# Map URL-friendly segment names to Groww constants
+SEGMENT_MAP = {
+  "cash": "SEGMENT_CASH",
+  "fno": "SEGMENT_FNO",
+  "commodity": "SEGMENT_COMMODITY",
+}
+
 
 @groww_portfolio_bp.route("/holdings", methods=["GET"])
 @require_auth
@@ -80,14 +87,7 @@ def get_groww_positions_by_segment(user_id: int, segment: str):
   Segments: SEGMENT_CASH, SEGMENT_FNO, SEGMENT_COMMODITY
   """
   try:
-    # Map URL-friendly segment names to Groww constants
-    segment_map = {
-      "cash": "SEGMENT_CASH",
-      "fno": "SEGMENT_FNO",
-      "commodity": "SEGMENT_COMMODITY",
-    }
-
-    groww_segment = segment_map.get(segment.lower())
+    groww_segment = SEGMENT_MAP.get(segment.lower())
     if not groww_segment:
       return jsonify({
         "success": False,
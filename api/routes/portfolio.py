@@ -2,15 +2,29 @@
 Portfolio API endpoints.
 """
 
-from flask import Blueprint, jsonify
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, Response, jsonify, request
 from datetime import datetime, timezone
 
-from services.portfolio import get_portfolio, get_holdings_only, get_mf_only
+import orjson
+from pydantic import TypeAdapter
+
+from models.portfolio import Holding, MFHolding
+from services.portfolio import get_holdings_only, get_mf_only
 from utils.jwt_auth import require_auth
 from tools.kite import KiteTokenExpiredError
-from tools.groww import GrowwTokenExpiredError
+from tools.groww import get_holdings as get_groww_holdings, GrowwTokenExpiredError
+from tools.screener import get_stock_fundamentals_batch
+from tools.mf_isin_mapper import get_mf_day_change_by_fund_names
 
 portfolio_bp = Blueprint("portfolio", __name__)
+logger = logging.getLogger(__name__)
+
+# Serialize holdings lists straight to JSON bytes (no intermediate dicts)
+_HOLDINGS_ADAPTER = TypeAdapter(list[Holding])
+_MF_HOLDINGS_ADAPTER = TypeAdapter(list[MFHolding])
 
 
 def _success_response(data, cached_at: datetime = None):
@@ -22,6 +36,25 @@ def _success_response(data, cached_at: datetime = None):
     })
 
 
+def _success_json_response(data_json: bytes, cached_at: datetime = None) -> Response:
+    """
+    Wrap already-serialized JSON data in the standard success response.
+
+    The ETag is a hash of the data only (not cached_at), so a client that
+    sends a matching If-None-Match gets an empty 304 instead of the body.
+    """
+    cached_at_json = orjson.dumps((cached_at or datetime.now(timezone.utc)).isoformat())
+    response = Response(
+        b'{"success":true,"data":' + data_json + b',"cached_at":' + cached_at_json + b'}',
+        mimetype="application/json",
+    )
+    # SHA-256 runs on the CPU's SHA extensions via OpenSSL, faster here than BLAKE2b
+    response.set_etag(hashlib.sha256(data_json).hexdigest()[:32])
+    # Let the browser keep the body but always revalidate (prices move)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+
 def _error_response(message: str, status_code: int = 500):
     """Return error response."""
     return jsonify({
@@ -30,31 +63,34 @@ def _error_response(message: str, status_code: int = 500):
     }), status_code
 
 
-@portfolio_bp.route("/holdings", methods=["GET"])
-@require_auth
-def get_holdings(user_id: int):
-    """
-    Get stock holdings only.
-    """
-    try:
-        holdings = get_holdings_only(user_id=user_id)
-        return _success_response(
-            [h.model_dump(mode="json") for h in holdings],
-        )
-    except KiteTokenExpiredError:
+def _exception_response(e: Exception):
+    """Map an exception raised while fetching portfolio data to an error response."""
+    if isinstance(e, KiteTokenExpiredError):
         return jsonify({
             "success": False,
             "error": "Kite session has expired. Please re-authenticate.",
             "error_type": "kite_token_expired",
         }), 401
-    except GrowwTokenExpiredError:
+    if isinstance(e, GrowwTokenExpiredError):
         return jsonify({
             "success": False,
             "error": "Groww session has expired. Please re-authenticate.",
             "error_type": "groww_token_expired",
         }), 401
+    return _error_response(str(e))
+
+
+@portfolio_bp.route("/holdings", methods=["GET"])
+@require_auth
+def get_holdings(user_id: int):
+    """
+    Get stock holdings only.
+    """
+    try:
+        holdings = get_holdings_only(user_id=user_id)
+        return _success_json_response(_HOLDINGS_ADAPTER.dump_json(holdings))
     except Exception as e:
-        return _error_response(str(e))
+        return _exception_response(e)
 
 
 @portfolio_bp.route("/mf/holdings", methods=["GET"])
@@ -65,29 +101,91 @@ def get_mf(user_id: int):
     """
     try:
         mf_holdings = get_mf_only(user_id=user_id)
-        return _success_response(
-            [m.model_dump(mode="json") for m in mf_holdings],
-        )
-    except KiteTokenExpiredError:
-        return jsonify({
-            "success": False,
-            "error": "Kite session has expired. Please re-authenticate.",
-            "error_type": "kite_token_expired",
-        }), 401
-    except GrowwTokenExpiredError:
-        return jsonify({
-            "success": False,
-            "error": "Groww session has expired. Please re-authenticate.",
-            "error_type": "groww_token_expired",
-        }), 401
+        return _success_json_response(_MF_HOLDINGS_ADAPTER.dump_json(mf_holdings))
     except Exception as e:
-        return _error_response(str(e))
+        return _exception_response(e)
 
 
 # ============================================================================
 # ENRICHMENT ENDPOINTS (Slow, fetch from external APIs)
 # ============================================================================
 
+def _build_quotes_map(user_id: int, holdings: list) -> dict:
+    """Fetch quotes for Groww holdings that don't have a current price yet."""
+    # Filter Groww holdings that don't have current_price
+    groww_symbols = [
+        h.symbol for h in holdings
+        if h.broker == "groww" and h.current_price is None
+    ]
+
+    if not groww_symbols:
+        return {}
+
+    # Build price map from Kite holdings (to skip quotes for shared stocks)
+    kite_price_map = {
+        h.symbol: h.current_price
+        for h in holdings
+        if h.broker == "kite" and h.current_price is not None
+    }
+
+    # Fetch Groww holdings with quotes
+    groww_holdings = get_groww_holdings(
+        user_id=user_id,
+        price_map=kite_price_map,
+        fetch_quotes=True
+    )
+
+    # Build response map
+    quotes_map = {}
+    for h in groww_holdings:
+        symbol = h.get('tradingsymbol', '')
+        if h.get('last_price') is not None:
+            quotes_map[symbol] = {
+                'last_price': h['last_price'],
+                'day_change': h.get('day_change'),
+                'day_change_percent': h.get('day_change_percentage')
+            }
+
+    return quotes_map
+
+
+def _build_market_cap_map(holdings: list) -> dict:
+    """
+    Fetch market cap categories for holdings from Screener.in.
+
+    Cached symbols are served directly; uncached ones are fetched
+    concurrently by tools.screener within its global rate limit.
+    """
+    fundamentals_map = get_stock_fundamentals_batch([h.symbol for h in holdings])
+    return {
+        symbol: fundamentals.market_cap_category if fundamentals else None
+        for symbol, fundamentals in fundamentals_map.items()
+    }
+
+
+def _build_mf_day_change_map(mf_holdings: list) -> dict:
+    """
+    Fetch day change data for mutual fund holdings from MFApi.in.
+
+    Scheme code lookups and day changes for all funds are fetched
+    concurrently (MFApi's rate limit is still enforced globally by tools.mfapi).
+    """
+    # Look funds up by scheme_name (mf.scheme_code contains the ISIN)
+    day_changes = get_mf_day_change_by_fund_names([mf.scheme_name for mf in mf_holdings])
+
+    day_change_map = {}
+    for mf in mf_holdings:
+        mf_change = day_changes.get(mf.scheme_name)
+        if mf_change:
+            # Key by the original scheme_code (ISIN) so frontend can match
+            day_change_map[mf.scheme_code] = {
+                'day_change': mf_change['change'],
+                'day_change_percent': mf_change['change_percent']
+            }
+
+    return day_change_map
+
+
 @portfolio_bp.route("/enriched/holdings/quotes", methods=["GET"])
 @require_auth
 def get_holdings_quotes_enrichment(user_id: int):
@@ -99,62 +197,13 @@ def get_holdings_quotes_enrichment(user_id: int):
 
     Time: ~10-20 seconds depending on number of Groww stocks.
     """
-    from tools.groww import get_holdings as get_groww_holdings
-
     try:
         # Get holdings to find which ones need quotes
         holdings = get_holdings_only(user_id=user_id)
+        return _success_response(_build_quotes_map(user_id, holdings))
 
-        # Filter Groww holdings that don't have current_price
-        groww_symbols = [
-            h.symbol for h in holdings
-            if h.broker == "groww" and h.current_price is None
-        ]
-
-        if not groww_symbols:
-            return _success_response({})
-
-        # Build price map from Kite holdings (to skip quotes for shared stocks)
-        kite_price_map = {
-            h.symbol: h.current_price
-            for h in holdings
-            if h.broker == "kite" and h.current_price is not None
-        }
-
-        # Fetch Groww holdings with quotes
-        groww_holdings = get_groww_holdings(
-            user_id=user_id,
-            price_map=kite_price_map,
-            fetch_quotes=True
-        )
-
-        # Build response map
-        quotes_map = {}
-        for h in groww_holdings:
-            symbol = h.get('tradingsymbol', '')
-            if h.get('last_price') is not None:
-                quotes_map[symbol] = {
-                    'last_price': h['last_price'],
-                    'day_change': h.get('day_change'),
-                    'day_change_percent': h.get('day_change_percentage')
-                }
-
-        return _success_response(quotes_map)
-
-    except KiteTokenExpiredError:
-        return jsonify({
-            "success": False,
-            "error": "Kite session has expired. Please re-authenticate.",
-            "error_type": "kite_token_expired",
-        }), 401
-    except GrowwTokenExpiredError:
-        return jsonify({
-            "success": False,
-            "error": "Groww session has expired. Please re-authenticate.",
-            "error_type": "groww_token_expired",
-        }), 401
     except Exception as e:
-        return _error_response(str(e))
+        return _exception_response(e)
 
 
 @portfolio_bp.route("/enriched/holdings/market-cap", methods=["GET"])
@@ -164,41 +213,13 @@ def get_market_cap_enrichment(user_id: int):
     Fetch market cap categories for stock holdings from Screener.in.
 
     Returns a map of {symbol: market_cap_category}.
-
-    Time: ~30-40 seconds (1 second per stock with rate limiting).
     """
-    from tools.screener import get_stock_fundamentals
-
     try:
         holdings = get_holdings_only(user_id=user_id)
+        return _success_response(_build_market_cap_map(holdings))
 
-        # Fetch market cap from Screener for each stock
-        market_cap_map = {}
-        for h in holdings:
-            if h.symbol not in market_cap_map:
-                try:
-                    fundamentals = get_stock_fundamentals(h.symbol)
-                    market_cap_map[h.symbol] = fundamentals.market_cap_category if fundamentals else None
-                except Exception as e:
-                    print(f"Failed to fetch market cap for {h.symbol}: {e}")
-                    market_cap_map[h.symbol] = None
-
-        return _success_response(market_cap_map)
-
-    except KiteTokenExpiredError:
-        return jsonify({
-            "success": False,
-            "error": "Kite session has expired. Please re-authenticate.",
-            "error_type": "kite_token_expired",
-        }), 401
-    except GrowwTokenExpiredError:
-        return jsonify({
-            "success": False,
-            "error": "Groww session has expired. Please re-authenticate.",
-            "error_type": "groww_token_expired",
-        }), 401
     except Exception as e:
-        return _error_response(str(e))
+        return _exception_response(e)
 
 
 @portfolio_bp.route("/enriched/mf/holdings/day-change", methods=["GET"])
@@ -208,46 +229,57 @@ def get_mf_day_change_enrichment(user_id: int):
     Fetch day change data for mutual fund holdings from MFApi.in.
 
     Returns a map of {scheme_code: {day_change, day_change_percent}}.
-
-    Time: ~10-15 seconds (0.5 second per MF with rate limiting).
     """
-    from tools.mf_isin_mapper import get_scheme_code_from_fund_name
-    from tools.mfapi import get_mf_day_change
-
     try:
         mf_holdings = get_mf_only(user_id=user_id)
+        return _success_response(_build_mf_day_change_map(mf_holdings))
 
-        # Fetch day change from MFApi for each MF
-        day_change_map = {}
-        for mf in mf_holdings:
-            # Use scheme_name to get the actual scheme code (mf.scheme_code contains ISIN)
-            api_scheme_code = get_scheme_code_from_fund_name(mf.scheme_name)
-            if api_scheme_code and api_scheme_code not in day_change_map:
-                try:
-                    mf_change = get_mf_day_change(api_scheme_code)
-                    if mf_change:
-                        # Key by the original scheme_code (ISIN) so frontend can match
-                        day_change_map[mf.scheme_code] = {
-                            'day_change': mf_change['change'],
-                            'day_change_percent': mf_change['change_percent']
-                        }
-                except Exception as e:
-                    print(f"Failed to fetch day change for {mf.scheme_name}: {e}")
-                    day_change_map[mf.scheme_code] = None
-
-        return _success_response(day_change_map)
-
-    except KiteTokenExpiredError:
-        return jsonify({
-            "success": False,
-            "error": "Kite session has expired. Please re-authenticate.",
-            "error_type": "kite_token_expired",
-        }), 401
-    except GrowwTokenExpiredError:
-        return jsonify({
-            "success": False,
-            "error": "Groww session has expired. Please re-authenticate.",
-            "error_type": "groww_token_expired",
-        }), 401
     except Exception as e:
-        return _error_response(str(e))
+        return _exception_response(e)
+
+
+@portfolio_bp.route("/enriched/all", methods=["GET"])
+@require_auth
+def get_all_enrichment(user_id: int):
+    """
+    Fetch quotes, market caps and MF day changes in one request.
+
+    Stock and MF holdings are fetched from the brokers once, independently,
+    and the three enrichments run concurrently, so the wall time is that of
+    the slowest one rather than the sum of all three.
+
+    Returns {quotes, market_cap, mf_day_change}, each shaped like the
+    response of the matching /enriched/* endpoint. A section whose holdings
+    fetch or enrichment fails is null; the others are still returned. If
+    every section fails, responds with the first error.
+    """
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        holdings_future = executor.submit(get_holdings_only, user_id=user_id)
+        mf_holdings_future = executor.submit(get_mf_only, user_id=user_id)
+
+        # Each enrichment waits only for the holdings it needs
+        section_futures = {
+            "quotes": executor.submit(
+                lambda: _build_quotes_map(user_id, holdings_future.result())
+            ),
+            "market_cap": executor.submit(
+                lambda: _build_market_cap_map(holdings_future.result())
+            ),
+            "mf_day_change": executor.submit(
+                lambda: _build_mf_day_change_map(mf_holdings_future.result())
+            ),
+        }
+
+        data = {}
+        errors = []
+        for section, future in section_futures.items():
+            try:
+                data[section] = future.result()
+            except Exception as e:
+                logger.warning("Enrichment %s failed for user %s: %s", section, user_id, e)
+                data[section] = None
+                errors.append(e)
+
+    if len(errors) == len(section_futures):
+        return _exception_response(errors[0])
+    return _success_response(data)
@@ -24,12 +24,28 @@ KITE_API_KEY = os.getenv("KITE_API_KEY")
 KITE_API_SECRET = os.getenv("KITE_API_SECRET")
 KITE_ACCESS_TOKEN = os.getenv("KITE_ACCESS_TOKEN")
 
+# Legacy file-based Kite token/profile storage (.kite_token, .kite_profile).
+# Only needed by the single-user CLI flow; the API stores everything in the database.
+LEGACY_FILE_TOKENS = os.getenv("LEGACY_FILE_TOKENS", "0") == "1"
+
+# CORS origins allowed to call the API (dashboard, marketing site, local dev)
+ALLOWED_ORIGINS = [
+    "http://localhost:3000",
+    "http://127.0.0.1:5000",
+    "http://localhost:5173",
+    "http://localhost:5174",
+    "https://dashboard-production-b3df.up.railway.app",
+    "https://api-production-9507.up.railway.app",
+]
+ALLOWED_ORIGINS += [url for url in (os.getenv("DASHBOARD_URL"), os.getenv("MARKETING_URL")) if url]
+
 # Cache settings
 CACHE_TTL_HOURS = 168  # 7 days (fundamentals don't change frequently)
 
 # Screener.in settings
 SCREENER_BASE_URL = "https://www.screener.in"
 SCREENER_RATE_LIMIT_DELAY = 1.0  # seconds between requests
+SCREENER_MAX_WORKERS = 8  # concurrent lookups per enrichment request
 
 # Claude model
 CLAUDE_MODEL = "claude-sonnet-4-20250514"
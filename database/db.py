@@ -2,7 +2,10 @@
 SQLite database connection and schema management.
 """
 
+import atexit
+import queue
 import sqlite3
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 from typing import Optional
@@ -12,22 +15,89 @@ from config import BASE_DIR
 # Database file path
 DB_PATH = BASE_DIR / "investez.db"
 
+# Schema version stored in PRAGMA user_version. Bump this whenever init_db()
+# gains a table, column, index or migration so existing databases re-run it.
+SCHEMA_VERSION = 1
+
+# Maximum number of idle connections kept open for reuse
+POOL_SIZE = 10
+
+# Idle connections shared across requests (LIFO so the warmest one is reused)
+_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=POOL_SIZE)
+
+# Prepared statements kept per connection. Pooled connections live for the
+# whole process, so every distinct query is only parsed once per connection.
+STATEMENT_CACHE_SIZE = 256
+
+# journal_mode=WAL is persistent on the database file, so it only needs
+# setting once per process rather than on every new connection
+_wal_enabled = False
+
+# brokers.broker_id -> brokers.id (brokers rows are seeded once and never change)
+_broker_pks: dict[str, int] = {}
+_broker_pks_lock = threading.Lock()
+
+
+def _open_connection() -> sqlite3.Connection:
+    """Open a new SQLite connection that can be handed between threads."""
+    conn = sqlite3.connect(
+        DB_PATH,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+
+    # WAL lets readers proceed while a write is in progress; with WAL,
+    # synchronous=NORMAL only fsyncs at checkpoints and stays crash-safe.
+    global _wal_enabled
+    if not _wal_enabled:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _wal_enabled = True
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache per connection
+    conn.execute("PRAGMA mmap_size=268435456")  # Read pages via a 256 MB shared mapping
+    return conn
+
 
 def get_connection() -> sqlite3.Connection:
     """
     Get a connection to the SQLite database.
+    Reuses an idle pooled connection when available, otherwise opens a new one.
     Returns Row objects that can be accessed by column name.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return _open_connection()
+
+
+def release_connection(conn: sqlite3.Connection) -> None:
+    """Return a connection to the pool, closing it if the pool is already full."""
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def close_pool() -> None:
+    """Close all idle pooled connections."""
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            return
+
+
+# Close idle connections on interpreter exit so the WAL is checkpointed
+atexit.register(close_pool)
 
 
 @contextmanager
 def get_db():
     """
     Context manager for database connections.
-    Automatically commits and closes the connection.
+    Automatically commits and returns the connection to the pool.
     """
     conn = get_connection()
     try:
@@ -37,16 +107,38 @@ def get_db():
         conn.rollback()
         raise
     finally:
-        conn.close()
+        release_connection(conn)
+
+
+def get_broker_pk(broker_id: str) -> Optional[int]:
+    """
+    Get the brokers table primary key for a broker identifier (e.g. 'kite').
+    Loads the whole brokers table once and serves later lookups from memory,
+    so unknown broker ids return None without another query.
+    """
+    with _broker_pks_lock:
+        if not _broker_pks:
+            with get_db() as conn:
+                rows = conn.execute("SELECT id, broker_id FROM brokers").fetchall()
+            _broker_pks.update({row["broker_id"]: row["id"] for row in rows})
+
+        return _broker_pks.get(broker_id)
 
 
 def init_db() -> None:
-    """Initialize the database with required tables."""
+    """
+    Initialize the database with required tables.
+    Does nothing if the database is already at SCHEMA_VERSION.
+    """
     with get_db() as conn:
         cursor = conn.cursor()
 
-        # Users table
-        cursor.execute("""
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return
+
+        # Users and brokers tables with their indexes, created in one batch
+        cursor.executescript("""
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 google_id TEXT UNIQUE NOT NULL,
@@ -55,24 +147,24 @@ def init_db() -> None:
                 profile_picture TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+            );
 
-        # Create index on google_id for faster lookups
-        cursor.execute("""
+            -- Index on google_id for faster lookups
             CREATE INDEX IF NOT EXISTS idx_users_google_id
-            ON users(google_id)
-        """)
+            ON users(google_id);
 
-        # Brokers table (catalog of available brokers)
-        cursor.execute("""
+            -- Index on email for lookups by account email
+            CREATE INDEX IF NOT EXISTS idx_users_email
+            ON users(email);
+
+            -- Brokers table (catalog of available brokers)
             CREATE TABLE IF NOT EXISTS brokers (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
                 broker_id TEXT UNIQUE NOT NULL,
                 oauth_enabled INTEGER DEFAULT 1,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+            );
         """)
 
         # Check if broker_credentials table exists and needs migration
@@ -98,6 +190,7 @@ def init_db() -> None:
                         api_secret_encrypted TEXT,
                         totp_secret_encrypted TEXT,
                         access_token_encrypted TEXT,
+                        broker_user_id TEXT,
                         status TEXT DEFAULT 'configured',
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -116,6 +209,9 @@ def init_db() -> None:
                 # Drop old table and rename new one
                 cursor.execute("DROP TABLE broker_credentials")
                 cursor.execute("ALTER TABLE broker_credentials_new RENAME TO broker_credentials")
+            elif 'broker_user_id' not in columns:
+                print("Migrating broker_credentials table to add broker_user_id...")
+                cursor.execute("ALTER TABLE broker_credentials ADD COLUMN broker_user_id TEXT")
         else:
             # Create table with updated schema
             cursor.execute("""
@@ -127,6 +223,7 @@ def init_db() -> None:
                     api_secret_encrypted TEXT,
                     totp_secret_encrypted TEXT,
                     access_token_encrypted TEXT,
+                    broker_user_id TEXT,
                     status TEXT DEFAULT 'configured',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -136,35 +233,31 @@ def init_db() -> None:
                 )
             """)
 
-        # Create indexes for faster lookups
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_broker_credentials_user_id
-            ON broker_credentials(user_id)
-        """)
-        cursor.execute("""
+        # Lookups by (user_id, broker_id) are served by the composite index
+        # SQLite builds for UNIQUE(user_id, broker_id); a separate user_id
+        # index would only duplicate its prefix and slow down writes.
+        # Seed brokers with Kite and Groww and record the schema version.
+        cursor.executescript(f"""
+            DROP INDEX IF EXISTS idx_broker_credentials_user_id;
+
             CREATE INDEX IF NOT EXISTS idx_broker_credentials_broker_id
-            ON broker_credentials(broker_id)
-        """)
+            ON broker_credentials(broker_id);
 
-        # Seed brokers table with Kite and Groww
-        cursor.execute("""
-            INSERT OR IGNORE INTO brokers (name, broker_id, oauth_enabled)
-            VALUES ('Zerodha Kite', 'kite', 1)
-        """)
-        cursor.execute("""
             INSERT OR IGNORE INTO brokers (name, broker_id, oauth_enabled)
-            VALUES ('Groww', 'groww', 1)
-        """)
+            VALUES ('Zerodha Kite', 'kite', 1), ('Groww', 'groww', 1);
 
-        conn.commit()
+            PRAGMA user_version = {SCHEMA_VERSION};
+        """)
 
 
 def reset_db() -> None:
     """Drop all tables and reinitialize. USE WITH CAUTION."""
-    if DB_PATH.exists():
-        DB_PATH.unlink()
+    global _wal_enabled
+    close_pool()
+    with _broker_pks_lock:
+        _broker_pks.clear()
+    _wal_enabled = False
+    # Remove WAL side files too, or SQLite may replay them into the new file
+    for path in (DB_PATH, DB_PATH.with_name(DB_PATH.name + "-wal"), DB_PATH.with_name(DB_PATH.name + "-shm")):
+        path.unlink(missing_ok=True)
     init_db()
-
-
-# Initialize database on module import
-init_db()
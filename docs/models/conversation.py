@@ -26,13 +26,14 @@ class Conversation(BaseModel):
     
     def add_user_message(self, content: str) -> Message:
         """Add a user message to the conversation."""
+        now = datetime.now()
         msg = Message(
             role="user",
             content=content,
-            timestamp=datetime.now()
+            timestamp=now
         )
         self.messages.append(msg)
-        self.updated_at = datetime.now()
+        self.updated_at = now
         return msg
     
     def add_assistant_message(
@@ -42,15 +43,16 @@ class Conversation(BaseModel):
         tools_used: Optional[list[str]] = None
     ) -> Message:
         """Add an assistant message to the conversation."""
+        now = datetime.now()
         msg = Message(
             role="assistant",
             content=content,
-            timestamp=datetime.now(),
+            timestamp=now,
             agent=agent,
             tools_used=tools_used
         )
         self.messages.append(msg)
-        self.updated_at = datetime.now()
+        self.updated_at = now
         return msg
     
     def get_context(self, max_messages: int = 10) -> list[dict]:
@@ -70,8 +72,8 @@ class Conversation(BaseModel):
         if not self.messages:
             return "Empty conversation"
         
-        user_msgs = [m for m in self.messages if m.role == "user"]
-        if user_msgs:
-            first_query = user_msgs[0].content[:50]
+        first_user_msg = next((m for m in self.messages if m.role == "user"), None)
+        if first_user_msg:
+            first_query = first_user_msg.content[:50]
             return f"{first_query}... ({len(self.messages)} messages)"
         return f"{len(self.messages)} messages"
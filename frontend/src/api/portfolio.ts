@@ -4,9 +4,7 @@ import type {
   Portfolio,
   Holding,
   MFHolding,
-  QuotesEnrichment,
-  MarketCapEnrichment,
-  MFDayChangeEnrichment
+  AllEnrichment
 } from '../types/portfolio'
 
 const api = axios.create({
@@ -61,33 +59,9 @@ export async function fetchMFHoldings(): Promise<ApiResponse<MFHolding[]>> {
 // ENRICHMENT API FUNCTIONS (Slow, external APIs)
 // ============================================================================
 
-export async function fetchHoldingsQuotes(): Promise<ApiResponse<QuotesEnrichment>> {
+export async function fetchAllEnrichment(): Promise<ApiResponse<AllEnrichment>> {
   try {
-    const { data } = await api.get('/portfolio/enriched/holdings/quotes')
-    return data
-  } catch (error: any) {
-    if (error.response?.data) {
-      return error.response.data
-    }
-    throw error
-  }
-}
-
-export async function fetchMarketCapEnrichment(): Promise<ApiResponse<MarketCapEnrichment>> {
-  try {
-    const { data } = await api.get('/portfolio/enriched/holdings/market-cap')
-    return data
-  } catch (error: any) {
-    if (error.response?.data) {
-      return error.response.data
-    }
-    throw error
-  }
-}
-
-export async function fetchMFDayChangeEnrichment(): Promise<ApiResponse<MFDayChangeEnrichment>> {
-  try {
-    const { data } = await api.get('/portfolio/enriched/mf/holdings/day-change')
+    const { data } = await api.get('/portfolio/enriched/all')
     return data
   } catch (error: any) {
     if (error.response?.data) {
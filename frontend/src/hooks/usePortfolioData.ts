@@ -2,9 +2,7 @@ import { useQuery } from '@tanstack/react-query'
 import {
   fetchHoldings,
   fetchMFHoldings,
-  fetchHoldingsQuotes,
-  fetchMarketCapEnrichment,
-  fetchMFDayChangeEnrichment,
+  fetchAllEnrichment,
 } from '../api/portfolio'
 
 interface UsePortfolioDataOptions {
@@ -12,12 +10,15 @@ interface UsePortfolioDataOptions {
 }
 
 /**
- * Hook to fetch portfolio data with progressive loading.
+ * Hook to fetch portfolio data in two stages.
  *
  * Data flow:
  * 1. Core data (holdings + MF holdings) loads immediately (~5s)
- * 2. Enrichment data loads in parallel after core data arrives
- * 3. UI updates progressively as data arrives
+ * 2. Enrichment data (quotes, market cap, MF day change) loads in one request
+ *    after core data arrives; the API runs the three lookups in parallel
+ * 3. UI renders core data first, then updates once when all enrichment
+ *    arrives together (a section that failed server-side comes back null and
+ *    those holdings keep their broker values)
  */
 export function usePortfolioData(options?: UsePortfolioDataOptions) {
   const { enabled = true } = options || {}
@@ -45,33 +46,11 @@ export function usePortfolioData(options?: UsePortfolioDataOptions) {
     refetchOnMount: false,
   })
 
-  // Enrichment data - fetched after core data arrives
-  const quotesQuery = useQuery({
-    queryKey: ['holdings-quotes'],
-    queryFn: fetchHoldingsQuotes,
-    enabled: enabled && (holdingsQuery.data?.success || false),
-    staleTime: Infinity,
-    gcTime: Infinity,
-    retry: false,
-    refetchOnWindowFocus: false,
-    refetchOnMount: false,
-  })
-
-  const marketCapQuery = useQuery({
-    queryKey: ['market-cap'],
-    queryFn: fetchMarketCapEnrichment,
-    enabled: enabled && (holdingsQuery.data?.success || false),
-    staleTime: Infinity,
-    gcTime: Infinity,
-    retry: false,
-    refetchOnWindowFocus: false,
-    refetchOnMount: false,
-  })
-
-  const mfDayChangeQuery = useQuery({
-    queryKey: ['mf-day-change'],
-    queryFn: fetchMFDayChangeEnrichment,
-    enabled: enabled && (mfHoldingsQuery.data?.success || false),
+  // Enrichment data - fetched once after core data arrives
+  const enrichmentQuery = useQuery({
+    queryKey: ['enrichment'],
+    queryFn: fetchAllEnrichment,
+    enabled: enabled && (holdingsQuery.data?.success || mfHoldingsQuery.data?.success || false),
     staleTime: Infinity,
     gcTime: Infinity,
     retry: false,
@@ -87,9 +66,9 @@ export function usePortfolioData(options?: UsePortfolioDataOptions) {
   // Extract data from responses
   const holdings = holdingsQuery.data?.data || []
   const mfHoldings = mfHoldingsQuery.data?.data || []
-  const quotesEnrichment = quotesQuery.data?.data || {}
-  const marketCapEnrichment = marketCapQuery.data?.data || {}
-  const mfDayChangeEnrichment = mfDayChangeQuery.data?.data || {}
+  const quotesEnrichment = enrichmentQuery.data?.data?.quotes || {}
+  const marketCapEnrichment = enrichmentQuery.data?.data?.market_cap || {}
+  const mfDayChangeEnrichment = enrichmentQuery.data?.data?.mf_day_change || {}
 
   // Merge enrichment data
   const enrichedHoldings = holdings.map((h) => {
@@ -140,7 +119,7 @@ export function usePortfolioData(options?: UsePortfolioDataOptions) {
 
   // Loading states
   const isLoadingCore = holdingsQuery.isLoading || mfHoldingsQuery.isLoading
-  const isLoadingEnrichment = quotesQuery.isLoading || marketCapQuery.isLoading || mfDayChangeQuery.isLoading
+  const isLoadingEnrichment = enrichmentQuery.isLoading
 
   // Error states
   const error = holdingsQuery.error || mfHoldingsQuery.error
@@ -157,10 +136,8 @@ export function usePortfolioData(options?: UsePortfolioDataOptions) {
     isLoadingEnrichment,
     isLoading: isLoadingCore || isLoadingEnrichment,
 
-    // Enrichment progress
-    hasQuotes: !!quotesQuery.data,
-    hasMarketCap: !!marketCapQuery.data,
-    hasMFDayChange: !!mfDayChangeQuery.data,
+    // Enrichment progress (quotes, market cap and MF day change arrive together)
+    hasEnrichment: !!enrichmentQuery.data,
 
     // Error handling
     error,
@@ -170,9 +147,7 @@ export function usePortfolioData(options?: UsePortfolioDataOptions) {
     refetch: () => {
       holdingsQuery.refetch()
       mfHoldingsQuery.refetch()
-      quotesQuery.refetch()
-      marketCapQuery.refetch()
-      mfDayChangeQuery.refetch()
+      enrichmentQuery.refetch()
     },
   }
 }
@@ -45,9 +45,7 @@ export default function Connections({ onNavigateToPortfolio }: ConnectionsProps)
       // Invalidate all portfolio queries when credentials are saved
       queryClient.invalidateQueries({ queryKey: ['holdings'] })
       queryClient.invalidateQueries({ queryKey: ['mf-holdings'] })
-      queryClient.invalidateQueries({ queryKey: ['holdings-quotes'] })
-      queryClient.invalidateQueries({ queryKey: ['market-cap'] })
-      queryClient.invalidateQueries({ queryKey: ['mf-day-change'] })
+      queryClient.invalidateQueries({ queryKey: ['enrichment'] })
       setConfiguringBroker(null)
       setApiKey('')
       setApiSecret('')
@@ -66,9 +64,7 @@ export default function Connections({ onNavigateToPortfolio }: ConnectionsProps)
       // Invalidate all portfolio queries when credentials are deleted
       queryClient.invalidateQueries({ queryKey: ['holdings'] })
       queryClient.invalidateQueries({ queryKey: ['mf-holdings'] })
-      queryClient.invalidateQueries({ queryKey: ['holdings-quotes'] })
-      queryClient.invalidateQueries({ queryKey: ['market-cap'] })
-      queryClient.invalidateQueries({ queryKey: ['mf-day-change'] })
+      queryClient.invalidateQueries({ queryKey: ['enrichment'] })
     },
   })
 
@@ -80,9 +76,7 @@ export default function Connections({ onNavigateToPortfolio }: ConnectionsProps)
       // Invalidate all portfolio queries
       queryClient.invalidateQueries({ queryKey: ['holdings'] })
       queryClient.invalidateQueries({ queryKey: ['mf-holdings'] })
-      queryClient.invalidateQueries({ queryKey: ['holdings-quotes'] })
-      queryClient.invalidateQueries({ queryKey: ['market-cap'] })
-      queryClient.invalidateQueries({ queryKey: ['mf-day-change'] })
+      queryClient.invalidateQueries({ queryKey: ['enrichment'] })
     },
   })
 
@@ -94,9 +88,7 @@ export default function Connections({ onNavigateToPortfolio }: ConnectionsProps)
       // Invalidate all portfolio queries
       queryClient.invalidateQueries({ queryKey: ['holdings'] })
       queryClient.invalidateQueries({ queryKey: ['mf-holdings'] })
-      queryClient.invalidateQueries({ queryKey: ['holdings-quotes'] })
-      queryClient.invalidateQueries({ queryKey: ['market-cap'] })
-      queryClient.invalidateQueries({ queryKey: ['mf-day-change'] })
+      queryClient.invalidateQueries({ queryKey: ['enrichment'] })
     },
   })
 
@@ -108,9 +100,7 @@ export default function Connections({ onNavigateToPortfolio }: ConnectionsProps)
       // Invalidate all portfolio queries
       queryClient.invalidateQueries({ queryKey: ['holdings'] })
       queryClient.invalidateQueries({ queryKey: ['mf-holdings'] })
-      queryClient.invalidateQueries({ queryKey: ['holdings-quotes'] })
-      queryClient.invalidateQueries({ queryKey: ['market-cap'] })
-      queryClient.invalidateQueries({ queryKey: ['mf-day-change'] })
+      queryClient.invalidateQueries({ queryKey: ['enrichment'] })
     },
   })
 
@@ -122,9 +112,7 @@ export default function Connections({ onNavigateToPortfolio }: ConnectionsProps)
       // Invalidate all portfolio queries when broker is authenticated
       queryClient.invalidateQueries({ queryKey: ['holdings'] })
       queryClient.invalidateQueries({ queryKey: ['mf-holdings'] })
-      queryClient.invalidateQueries({ queryKey: ['holdings-quotes'] })
-      queryClient.invalidateQueries({ queryKey: ['market-cap'] })
-      queryClient.invalidateQueries({ queryKey: ['mf-day-change'] })
+      queryClient.invalidateQueries({ queryKey: ['enrichment'] })
       setError('')
     },
     onError: (err: any) => {
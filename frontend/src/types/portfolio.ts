@@ -92,3 +92,10 @@ export interface MFDayChangeEnrichment {
     day_change_percent: number
   } | null
 }
+
+// Each section is null if that enrichment failed (the others are still returned)
+export interface AllEnrichment {
+  quotes: QuotesEnrichment | null
+  market_cap: MarketCapEnrichment | null
+  mf_day_change: MFDayChangeEnrichment | null
+}
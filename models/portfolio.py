@@ -1,9 +1,16 @@
+from dataclasses import dataclass
+
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 
 
-class Holding(BaseModel):
+# Holdings are built once per broker row on every portfolio fetch, so they are
+# plain slotted dataclasses rather than validated models. Callers pass values
+# of the annotated types; Pydantic still serializes them inside Portfolio and
+# via TypeAdapter.
+@dataclass(slots=True, kw_only=True)
+class Holding:
     """Individual stock holding in portfolio."""
     symbol: str
     exchange: str
@@ -21,7 +28,8 @@ class Holding(BaseModel):
     broker: str  # Which broker this holding is from (kite, groww, etc.)
 
 
-class MFHolding(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class MFHolding:
     """Mutual fund holding in portfolio."""
     scheme_code: str
     scheme_name: str
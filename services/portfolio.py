@@ -7,15 +7,18 @@ Usage:
     portfolio = get_portfolio()
 """
 
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
+from functools import wraps
+from typing import Any, Callable, Optional
 from collections import defaultdict
 
 from tools.kite import get_holdings as get_kite_holdings, get_mf_holdings, KiteTokenExpiredError
 from tools.groww import get_holdings as get_groww_holdings, GrowwTokenExpiredError
-from tools.screener import get_stock_fundamentals
-from tools.mfapi import get_mf_day_change
-from tools.mf_isin_mapper import get_scheme_code_from_fund_name
+from tools.screener import get_stock_fundamentals_batch
+from tools.mf_isin_mapper import get_mf_day_change_by_fund_names
 from models.portfolio import (
     Holding,
     MFHolding,
@@ -25,47 +28,113 @@ from models.portfolio import (
 )
 
 
-def _enrich_holding(raw: dict, broker: str, skip_screener: bool = False) -> Holding:
+logger = logging.getLogger(__name__)
+
+# In-flight broker fetches keyed by (function name, user_id)
+_inflight: dict[tuple[str, Optional[int]], Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight(fetch: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Coalesce concurrent calls for the same user into one upstream fetch.
+
+    While a call for a user is running, other callers for that user wait
+    for it and get the same result (or exception) instead of hitting the
+    brokers again. Nothing is cached once the call finishes.
+    """
+    @wraps(fetch)
+    def wrapper(user_id: Optional[int] = None) -> Any:
+        key = (fetch.__name__, user_id)
+        with _inflight_lock:
+            future = _inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                _inflight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fetch(user_id=user_id)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                del _inflight[key]
+
+    return wrapper
+
+
+def _raw_symbol(raw: dict) -> str:
+    """Get the trading symbol from a raw Kite or Groww holding."""
+    return raw.get("tradingsymbol", "") or raw.get("trading_symbol", "")
+
+
+def _raw_value(raw: dict) -> float:
+    """Get quantity * last price, falling back to the average price without a quote."""
+    price = raw.get("last_price", 0)
+    if price is None:
+        price = raw.get("average_price", 0)
+    return raw.get("quantity", 0) * price
+
+
+def _fetch_market_caps(symbols: set[str]) -> dict[str, Optional[str]]:
+    """Get market cap categories for several symbols from Screener (cached)."""
+    fundamentals_map = get_stock_fundamentals_batch(list(symbols))
+    return {
+        symbol: fundamentals.market_cap_category if fundamentals else None
+        for symbol, fundamentals in fundamentals_map.items()
+    }
+
+
+def _as_int(value: Any) -> int:
+    """Convert a broker number to int, rejecting fractional values."""
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"Expected a whole number, got {value!r}")
+    return int(number)
+
+
+def _as_optional_float(value: Any) -> Optional[float]:
+    """Convert a broker number to float, keeping None."""
+    return float(value) if value is not None else None
+
+
+def _enrich_holding(raw: dict, broker: str, market_cap_category: Optional[str] = None) -> Holding:
     """Convert raw broker holding to enriched Holding model.
 
     Args:
         raw: Raw holding data from broker API
         broker: Broker name (kite, groww, etc.)
-        skip_screener: If True, skip Screener.in API call for market cap
+        market_cap_category: Market cap from Screener, if already fetched
 
     Returns:
         Holding with optional fields (current_price, day_change, market_cap_category)
     """
-    symbol = raw.get("tradingsymbol", "") or raw.get("trading_symbol", "")
-    quantity = raw.get("quantity", 0)
-    avg_price = raw.get("average_price", 0)
-    current_price = raw.get("last_price")
+    symbol = _raw_symbol(raw)
+    # Holding is a plain dataclass, so coerce broker values here
+    quantity = _as_int(raw.get("quantity", 0))
+    avg_price = float(raw.get("average_price", 0))
+    current_price = _as_optional_float(raw.get("last_price"))
 
     # Calculate value and P&L
     invested = quantity * avg_price
 
     if current_price is not None:
         value = quantity * current_price
-        pnl = raw.get("pnl", value - invested)
-        pnl_percent = (pnl / invested * 100) if invested > 0 else 0
+        pnl = float(raw.get("pnl", value - invested))
+        pnl_percent = (pnl / invested * 100) if invested > 0 else 0.0
     else:
         # No current price available - can't calculate P&L
         value = invested  # Fallback for display purposes
         pnl = None
         pnl_percent = None
 
-    # Get market cap from Screener (cached) - only if not skipped
-    market_cap_category = None
-    if not skip_screener:
-        try:
-            fundamentals = get_stock_fundamentals(symbol)
-            if fundamentals:
-                market_cap_category = fundamentals.market_cap_category
-            else:
-                print(f"[{broker}] No fundamentals found for {symbol}")
-        except Exception as e:
-            print(f"[{broker}] Failed to fetch market cap for {symbol}: {e}")
-
     return Holding(
         symbol=symbol,
         exchange=raw.get("exchange", "NSE"),
@@ -77,8 +146,8 @@ def _enrich_holding(raw: dict, broker: str, skip_screener: bool = False) -> Hold
         invested=round(invested, 2),
         pnl=round(pnl, 2) if pnl is not None else None,
         pnl_percent=round(pnl_percent, 2) if pnl_percent is not None else None,
-        day_change=raw.get("day_change"),
-        day_change_percent=raw.get("day_change_percentage"),
+        day_change=_as_optional_float(raw.get("day_change")),
+        day_change_percent=_as_optional_float(raw.get("day_change_percentage")),
         market_cap_category=market_cap_category,
         broker=broker,
     )
@@ -111,47 +180,42 @@ def _parse_mf_market_cap(scheme_name: str) -> str:
     return "Multi Cap"
 
 
-def _process_mf_holding(raw: dict, broker: str, skip_day_change: bool = False) -> MFHolding:
+def _mf_scheme_name(raw: dict) -> str:
+    """Get the fund name from a raw Kite MF holding."""
+    return raw.get("fund", raw.get("tradingsymbol", ""))
+
+
+def _process_mf_holding(raw: dict, broker: str, mf_change: Optional[dict] = None) -> MFHolding:
     """Convert raw Kite MF holding to MFHolding model.
 
     Args:
         raw: Raw MF holding data from broker API
         broker: Broker name (kite, groww, etc.)
-        skip_day_change: If True, skip MFApi.in call for day change
+        mf_change: Per-unit day change from MFApi.in, if already fetched
 
     Returns:
         MFHolding with optional day_change fields
     """
-    units = raw.get("quantity", 0)
-    avg_nav = raw.get("average_price", 0)
-    current_nav = raw.get("last_price", 0)
+    # MFHolding is a plain dataclass, so coerce broker values here
+    units = float(raw.get("quantity", 0))
+    avg_nav = float(raw.get("average_price", 0))
+    current_nav = float(raw.get("last_price", 0))
 
     value = units * current_nav
     invested = units * avg_nav
     # Always calculate P&L from value - invested (don't trust raw pnl for MF)
     pnl = value - invested
-    pnl_percent = (pnl / invested * 100) if invested > 0 else 0
+    pnl_percent = (pnl / invested * 100) if invested > 0 else 0.0
 
-    scheme_name = raw.get("fund", raw.get("tradingsymbol", ""))
+    scheme_name = _mf_scheme_name(raw)
     market_cap_category = _parse_mf_market_cap(scheme_name)
 
-    # Try to get day change from MFApi.in using fund name search - only if not skipped
     day_change = None
     day_change_percent = None
-
-    if not skip_day_change and scheme_name:
-        try:
-            # Search for scheme code using fund name
-            scheme_code = get_scheme_code_from_fund_name(scheme_name)
-            if scheme_code:
-                mf_change = get_mf_day_change(scheme_code)
-                if mf_change:
-                    # Day change in portfolio value (change per unit * total units)
-                    day_change = mf_change["change"] * units
-                    day_change_percent = mf_change["change_percent"]
-        except Exception as e:
-            # Silently fail - day change is optional enhancement
-            print(f"Could not fetch day change for MF {scheme_name}: {e}")
+    if mf_change:
+        # Day change in portfolio value (change per unit * total units)
+        day_change = float(mf_change["change"]) * units
+        day_change_percent = float(mf_change["change_percent"])
 
     return MFHolding(
         scheme_code=raw.get("tradingsymbol", ""),  # Store ISIN as scheme_code for display
@@ -215,6 +279,7 @@ def _calculate_allocation(
     )
 
 
+@_single_flight
 def get_portfolio(user_id: Optional[int] = None) -> Optional[Portfolio]:
     """
     Fetch and analyze complete portfolio from all connected brokers (Kite, Groww).
@@ -223,6 +288,9 @@ def get_portfolio(user_id: Optional[int] = None) -> Optional[Portfolio]:
         user_id: User ID to fetch portfolio for. If provided, uses database-stored tokens.
 
     Returns Portfolio with holdings, MF holdings, and allocations from all brokers.
+    Holdings without a quote (pnl or day_change is None) are left out of the
+    P&L and day change totals instead of failing the whole portfolio; their
+    invested amount is still counted.
     """
     # Fetch raw data from Kite
     raw_kite_holdings = get_kite_holdings(user_id=user_id)
@@ -250,33 +318,68 @@ def get_portfolio(user_id: Optional[int] = None) -> Optional[Portfolio]:
     if not all_raw_holdings and not raw_mf:
         return None
 
-    # Calculate total values for summary and allocation
-    stocks_value = sum(
-        h.get("quantity", 0) * h.get("last_price", 0)
-        for h, _ in all_raw_holdings
-    )
+    # Calculate total values for summary and allocation. A holding with no
+    # quote is valued at its average price, matching Holding.value.
+    stocks_value = sum(_raw_value(h) for h, _ in all_raw_holdings)
     mf_value = sum(
         m.get("quantity", 0) * m.get("last_price", 0)
         for m in (raw_mf or [])
     )
     total_value = stocks_value + mf_value
 
+    # Fetch market caps and MF day changes concurrently, then build holdings locally.
+    # Both are optional enrichments, so a failure leaves those fields empty.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        market_caps_future = executor.submit(
+            _fetch_market_caps, {_raw_symbol(h) for h, _ in all_raw_holdings}
+        )
+        mf_day_changes_future = executor.submit(
+            get_mf_day_change_by_fund_names, [_mf_scheme_name(m) for m in (raw_mf or [])]
+        )
+
+    try:
+        market_caps = market_caps_future.result()
+    except Exception as e:
+        logger.warning("Failed to fetch market caps: %s", e)
+        market_caps = {}
+
+    try:
+        mf_day_changes = mf_day_changes_future.result()
+    except Exception as e:
+        logger.warning("Failed to fetch MF day changes: %s", e)
+        mf_day_changes = {}
+
     # Process holdings with broker information
-    holdings = [_enrich_holding(h, broker) for h, broker in all_raw_holdings]
-    mf_holdings = [_process_mf_holding(m, "kite") for m in (raw_mf or [])]
+    holdings = [
+        _enrich_holding(h, broker, market_caps.get(_raw_symbol(h)))
+        for h, broker in all_raw_holdings
+    ]
+    mf_holdings = [
+        _process_mf_holding(m, "kite", mf_day_changes.get(_mf_scheme_name(m)))
+        for m in (raw_mf or [])
+    ]
 
-    # Calculate totals
-    stocks_invested = sum(h.invested for h in holdings)
-    mf_invested = sum(m.invested for m in mf_holdings)
-    total_invested = stocks_invested + mf_invested
+    # Calculate totals (one pass over each holdings list). Holdings missing
+    # a price or day change (no quote available) add nothing to those totals.
+    stocks_invested = stocks_pnl = stocks_day_change = 0
+    for h in holdings:
+        stocks_invested += h.invested
+        if h.pnl is not None:
+            stocks_pnl += h.pnl
+        if h.day_change is not None:
+            stocks_day_change += h.day_change * h.quantity
+
+    mf_invested = mf_pnl = mf_day_change = 0
+    for m in mf_holdings:
+        mf_invested += m.invested
+        mf_pnl += m.pnl
+        if m.day_change is not None:
+            mf_day_change += m.day_change
 
-    stocks_pnl = sum(h.pnl for h in holdings)
-    mf_pnl = sum(m.pnl for m in mf_holdings)
+    total_invested = stocks_invested + mf_invested
     total_pnl = stocks_pnl + mf_pnl
     total_pnl_percent = (total_pnl / total_invested * 100) if total_invested > 0 else 0
 
-    stocks_day_change = sum(h.day_change * h.quantity for h in holdings)
-    mf_day_change = sum(m.day_change for m in mf_holdings)
     day_pnl = stocks_day_change + mf_day_change
     day_pnl_percent = (day_pnl / total_value * 100) if total_value > 0 else 0
 
@@ -310,6 +413,7 @@ def get_portfolio(user_id: Optional[int] = None) -> Optional[Portfolio]:
     )
 
 
+@_single_flight
 def get_holdings_only(user_id: Optional[int] = None) -> list[Holding]:
     """Get stock holdings from all brokers without enrichment data (fast).
 
@@ -331,13 +435,14 @@ def get_holdings_only(user_id: Optional[int] = None) -> list[Holding]:
 
     holdings = []
     if raw_kite_holdings:
-        holdings.extend([_enrich_holding(h, "kite", skip_screener=True) for h in raw_kite_holdings])
+        holdings.extend([_enrich_holding(h, "kite") for h in raw_kite_holdings])
     if raw_groww_holdings:
-        holdings.extend([_enrich_holding(h, "groww", skip_screener=True) for h in raw_groww_holdings])
+        holdings.extend([_enrich_holding(h, "groww") for h in raw_groww_holdings])
 
     return holdings
 
 
+@_single_flight
 def get_mf_only(user_id: Optional[int] = None) -> list[MFHolding]:
     """Get mutual fund holdings without day change enrichment (fast).
 
@@ -350,4 +455,4 @@ def get_mf_only(user_id: Optional[int] = None) -> list[MFHolding]:
     if not raw_mf:
         return []
 
-    return [_process_mf_holding(m, "kite", skip_day_change=True) for m in raw_mf]
+    return [_process_mf_holding(m, "kite") for m in raw_mf]
@@ -42,16 +42,18 @@ def get_cached(cache_type: str, key: str, max_age_minutes: Optional[int] = None)
         max_age_minutes: Optional max age in minutes. If None, uses CACHE_TTL_HOURS.
     """
     cache_path = get_cache_path(cache_type, key)
-
     ttl_hours = (max_age_minutes / 60) if max_age_minutes else CACHE_TTL_HOURS
-    if not is_cache_valid(cache_path, ttl_hours):
-        return None
 
+    # Read the file once and check its timestamp in place
     try:
         with open(cache_path, "r", encoding="utf-8") as f:
             data = json.load(f)
+
+        cached_at = datetime.fromisoformat(data.get("cached_at", ""))
+        if datetime.now() >= cached_at + timedelta(hours=ttl_hours):
+            return None
         return data.get("data")
-    except (json.JSONDecodeError, IOError):
+    except (json.JSONDecodeError, IOError, ValueError):
         return None
 
 
@@ -16,8 +16,9 @@ from growwapi import GrowwAPI
 from growwapi.groww.exceptions import GrowwAPIException
 import pyotp
 
-from database.db import get_db
+from database.db import get_db, get_broker_pk
 from utils.crypto import decrypt_data, encrypt_data
+from utils.cred_cache import set_cached_credential
 
 
 class GrowwTokenExpiredError(Exception):
@@ -98,8 +99,10 @@ def _save_access_token(user_id: int, access_token: str) -> None:
         cursor.execute("""
             UPDATE broker_credentials
             SET access_token_encrypted = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND broker_id = (SELECT id FROM brokers WHERE broker_id = 'groww')
-        """, (access_token_encrypted, user_id))
+            WHERE user_id = ? AND broker_id = ?
+        """, (access_token_encrypted, user_id, get_broker_pk("groww")))
+
+    set_cached_credential(user_id, "groww", "access_token", access_token)
 
 
 def get_holdings(
@@ -15,6 +15,7 @@ Usage:
 """
 
 import os
+import threading
 import webbrowser
 from datetime import datetime, timedelta
 from typing import Optional
@@ -24,6 +25,9 @@ from kiteconnect import KiteConnect
 from kiteconnect.exceptions import TokenException
 
 from config import KITE_API_KEY, KITE_API_SECRET, BASE_DIR
+from database.db import get_db, get_broker_pk
+from utils.crypto import decrypt_data
+from utils.cred_cache import get_cached_credential, set_cached_credential
 from models.stock import StockQuote, PriceHistory
 from typing import Any
 
@@ -39,6 +43,30 @@ TOKEN_FILE = BASE_DIR / ".kite_token"
 # Global Kite instance
 _kite: Optional[KiteConnect] = None
 
+# Reusable Kite clients keyed by (api_key, access_token). Each client keeps its
+# own requests session, so reusing one keeps the TLS connection to Kite alive.
+KITE_CLIENT_CACHE_MAX_ENTRIES = 256
+_KITE_CLIENT_CACHE: dict[tuple[str, Optional[str]], KiteConnect] = {}
+_kite_client_lock = threading.Lock()
+
+# Access tokens Kite has already rejected. A rejected token never becomes
+# valid again, so later calls with it fail fast instead of re-asking Kite;
+# re-authenticating issues a new token, which is not in this set.
+EXPIRED_TOKENS_MAX_ENTRIES = 1024
+_expired_tokens: set[str] = set()
+
+SQL_GET_API_KEY = """
+    SELECT api_key
+    FROM broker_credentials
+    WHERE user_id = ? AND broker_id = ?
+"""
+
+SQL_GET_ACCESS_TOKEN = """
+    SELECT access_token_encrypted
+    FROM broker_credentials
+    WHERE user_id = ? AND broker_id = ?
+"""
+
 
 def _load_token() -> Optional[str]:
     """Load access token from file."""
@@ -70,6 +98,93 @@ def _save_token(token: str) -> None:
         f.write(f"{token}\n{expiry.isoformat()}")
 
 
+def get_kite_client(api_key: str, access_token: Optional[str] = None) -> KiteConnect:
+    """
+    Get a cached KiteConnect client for an API key and access token.
+
+    Clients are only shared between callers using the same token, so callers
+    must not call set_access_token() (or generate_session()) on the result.
+
+    Args:
+        api_key: Kite Connect API key
+        access_token: Access token to authenticate with, or None for
+                      unauthenticated calls such as login_url()
+    """
+    key = (api_key, access_token)
+    with _kite_client_lock:
+        kite = _KITE_CLIENT_CACHE.get(key)
+        if kite is None:
+            if len(_KITE_CLIENT_CACHE) >= KITE_CLIENT_CACHE_MAX_ENTRIES:
+                # Evict the oldest client (dicts keep insertion order)
+                _KITE_CLIENT_CACHE.pop(next(iter(_KITE_CLIENT_CACHE)))
+            kite = KiteConnect(api_key=api_key, access_token=access_token)
+            _KITE_CLIENT_CACHE[key] = kite
+        return kite
+
+
+def _check_token_not_expired(kite: KiteConnect) -> None:
+    """Raise KiteTokenExpiredError if Kite already rejected this client's token."""
+    if kite.access_token in _expired_tokens:
+        raise KiteTokenExpiredError("Kite access token has expired. Please re-authenticate.")
+
+
+def _mark_token_expired(kite: KiteConnect) -> None:
+    """Remember that Kite rejected this client's token."""
+    if not kite.access_token:
+        return
+    with _kite_client_lock:
+        if len(_expired_tokens) >= EXPIRED_TOKENS_MAX_ENTRIES:
+            _expired_tokens.clear()
+        _expired_tokens.add(kite.access_token)
+
+
+def get_user_api_key(user_id: int) -> Optional[str]:
+    """
+    Get user's Kite API key from database (cached).
+    Never decrypts the API secret.
+    """
+    cached = get_cached_credential(user_id, "kite", "credentials")
+    if cached:
+        return cached[0]
+
+    api_key = get_cached_credential(user_id, "kite", "api_key")
+    if api_key:
+        return api_key
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(SQL_GET_API_KEY, (user_id, get_broker_pk("kite")))
+
+        row = cursor.fetchone()
+        if not row or not row["api_key"]:
+            return None
+
+        api_key = row["api_key"]
+
+    set_cached_credential(user_id, "kite", "api_key", api_key)
+    return api_key
+
+
+def get_user_access_token(user_id: int) -> Optional[str]:
+    """Get user's decrypted Kite access token from database (cached)."""
+    cached = get_cached_credential(user_id, "kite", "access_token")
+    if cached:
+        return cached
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(SQL_GET_ACCESS_TOKEN, (user_id, get_broker_pk("kite")))
+
+        row = cursor.fetchone()
+        if not row or not row["access_token_encrypted"]:
+            return None
+
+        access_token = decrypt_data(row["access_token_encrypted"])
+
+    set_cached_credential(user_id, "kite", "access_token", access_token)
+    return access_token
+
+
 def get_kite(user_id: Optional[int] = None) -> Optional[KiteConnect]:
     """
     Get authenticated Kite instance.
@@ -82,37 +197,19 @@ def get_kite(user_id: Optional[int] = None) -> Optional[KiteConnect]:
 
     # If user_id provided, use database-stored credentials and token
     if user_id is not None:
-        from database.db import get_db
-        from utils.crypto import decrypt_data
-
-        # Get user's Kite credentials from database
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT bc.api_key, bc.access_token_encrypted
-                FROM broker_credentials bc
-                JOIN brokers b ON bc.broker_id = b.id
-                WHERE bc.user_id = ? AND b.broker_id = 'kite'
-            """, (user_id,))
-
-            row = cursor.fetchone()
-            if not row:
-                print(f"Error: No Kite credentials found for user {user_id}")
-                return None
-
-            api_key = row["api_key"]
-            access_token_encrypted = row["access_token_encrypted"]
-
-            if not access_token_encrypted:
-                print(f"Error: Kite not authenticated for user {user_id}")
-                return None
-
-            access_token = decrypt_data(access_token_encrypted)
-
-            # Create Kite instance with user's credentials
-            kite = KiteConnect(api_key=api_key)
-            kite.set_access_token(access_token)
-            return kite
+        # Get user's Kite credentials (cached, same as the auth routes)
+        api_key = get_user_api_key(user_id)
+        if not api_key:
+            print(f"Error: No Kite credentials found for user {user_id}")
+            return None
+
+        access_token = get_user_access_token(user_id)
+        if not access_token:
+            print(f"Error: Kite not authenticated for user {user_id}")
+            return None
+
+        # Reuse the Kite client for the user's credentials
+        return get_kite_client(api_key, access_token)
 
     # Legacy file-based token (backward compatibility)
     if _kite is not None:
@@ -355,11 +452,14 @@ def get_holdings(user_id: Optional[int] = None) -> list[dict[str, Any]]:
     if not kite:
         return []
 
+    _check_token_not_expired(kite)
+
     try:
         holdings = kite.holdings()
         return holdings if holdings else []
     except TokenException as e:
         # Token expired - raise custom exception for upstream handling
+        _mark_token_expired(kite)
         raise KiteTokenExpiredError("Kite access token has expired. Please re-authenticate.") from e
     except Exception as e:
         print(f"Error fetching holdings: {e}")
@@ -403,11 +503,14 @@ def get_mf_holdings(user_id: Optional[int] = None) -> list[dict[str, Any]]:
     if not kite:
         return []
 
+    _check_token_not_expired(kite)
+
     try:
         mf_holdings = kite.mf_holdings()
         return mf_holdings if mf_holdings else []
     except TokenException as e:
         # Token expired - raise custom exception for upstream handling
+        _mark_token_expired(kite)
         raise KiteTokenExpiredError("Kite access token has expired. Please re-authenticate.") from e
     except Exception as e:
         print(f"Error fetching MF holdings: {e}")
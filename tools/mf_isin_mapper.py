@@ -7,11 +7,15 @@ Usage:
     scheme_code = get_scheme_code_from_fund_name("Parag Parikh Flexi Cap Fund")
 """
 
+import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-import requests
 
 from storage.cache import get_cached, set_cached
+from tools.mfapi import MAX_WORKERS, get_mf_day_change_batch, search_mf
+
+logger = logging.getLogger(__name__)
 
 
 def get_scheme_code_from_fund_name(fund_name: str) -> Optional[str]:
@@ -43,13 +47,9 @@ def get_scheme_code_from_fund_name(fund_name: str) -> Optional[str]:
     words = search_terms.split()[:4]
     search_query = " ".join(words)
 
-    url = "https://api.mfapi.in/mf/search"
-    params = {"q": search_query}
-
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        results = response.json()
+        # Goes through tools.mfapi's shared session and global rate limit
+        results = search_mf(search_query)
 
         if not results or len(results) == 0:
             return None
@@ -92,3 +92,39 @@ def get_scheme_code_from_fund_name(fund_name: str) -> Optional[str]:
     except Exception as e:
         print(f"Error searching for MF scheme '{fund_name}': {e}")
         return None
+
+
+def get_mf_day_change_by_fund_names(fund_names: list[str]) -> dict[str, Optional[dict]]:
+    """
+    Calculate today's NAV change for several funds identified by name.
+
+    Names are matched to MFApi scheme codes concurrently, then day changes
+    are fetched once per unique scheme code via get_mf_day_change_batch().
+    Both steps stay within tools.mfapi's global rate limit.
+
+    Args:
+        fund_names: Fund names as reported by the broker (duplicates are looked up once)
+
+    Returns:
+        Dict mapping each fund name to its get_mf_day_change() result,
+        or None if it could not be matched or fetched
+    """
+    unique_names = [name for name in dict.fromkeys(fund_names) if name]
+    if not unique_names:
+        return {}
+
+    def _safe_scheme_code(fund_name: str) -> Optional[str]:
+        try:
+            return get_scheme_code_from_fund_name(fund_name)
+        except Exception as e:
+            logger.warning("Error finding MF scheme code for %s: %s", fund_name, e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(unique_names))) as executor:
+        scheme_codes = dict(zip(unique_names, executor.map(_safe_scheme_code, unique_names)))
+
+    day_changes = get_mf_day_change_batch([code for code in scheme_codes.values() if code])
+    return {
+        fund_name: day_changes.get(code) if code else None
+        for fund_name, code in scheme_codes.items()
+    }
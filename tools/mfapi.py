@@ -11,7 +11,10 @@ Usage:
     history = get_mf_historical_nav("119551", days=2)
 """
 
+import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 import requests
@@ -22,18 +25,34 @@ from storage.cache import get_cached, set_cached
 # Base URL for MFApi.in
 MFAPI_BASE_URL = "https://api.mfapi.in"
 
-# Track last request time for rate limiting
-_last_request_time: float = 0
+# Earliest time the next request may start (shared by all threads)
+_next_request_time: float = 0
+_rate_limit_lock = threading.Lock()
 RATE_LIMIT_DELAY = 0.5  # 500ms between requests
 
+# Concurrent lookups for batch helpers (here and in tools.mf_isin_mapper)
+MAX_WORKERS = 8
+
+# Shared HTTP session so repeated calls reuse the keep-alive connection
+_session = requests.Session()
+
+logger = logging.getLogger(__name__)
+
 
 def _rate_limit():
-    """Ensure we don't hit MFApi too fast."""
-    global _last_request_time
-    elapsed = time.time() - _last_request_time
-    if elapsed < RATE_LIMIT_DELAY:
-        time.sleep(RATE_LIMIT_DELAY - elapsed)
-    _last_request_time = time.time()
+    """
+    Ensure we don't hit MFApi too fast.
+    Safe to call from multiple threads: each caller reserves the next free
+    slot under the lock and sleeps outside it.
+    """
+    global _next_request_time
+    with _rate_limit_lock:
+        now = time.monotonic()
+        start = max(now, _next_request_time)
+        _next_request_time = start + RATE_LIMIT_DELAY
+
+    if start > now:
+        time.sleep(start - now)
 
 
 def get_mf_nav(scheme_code: str, force_refresh: bool = False) -> Optional[dict]:
@@ -65,7 +84,7 @@ def get_mf_nav(scheme_code: str, force_refresh: bool = False) -> Optional[dict]:
     url = f"{MFAPI_BASE_URL}/mf/{scheme_code}"
 
     try:
-        response = requests.get(url, timeout=10)
+        response = _session.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -132,7 +151,7 @@ def get_mf_historical_nav(
     url = f"{MFAPI_BASE_URL}/mf/{scheme_code}"
 
     try:
-        response = requests.get(url, timeout=10)
+        response = _session.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -202,13 +221,51 @@ def get_mf_day_change(scheme_code: str) -> Optional[dict]:
     }
 
 
+def get_mf_day_change_batch(scheme_codes: list[str]) -> dict[str, Optional[dict]]:
+    """
+    Calculate today's NAV change for several mutual funds concurrently.
+
+    Args:
+        scheme_codes: MF scheme codes (duplicates are fetched once)
+
+    Returns:
+        Dict mapping each scheme code to its get_mf_day_change() result,
+        or None if it could not be fetched
+    """
+    unique_codes = list(dict.fromkeys(scheme_codes))
+    if not unique_codes:
+        return {}
+
+    def _safe_day_change(scheme_code: str) -> Optional[dict]:
+        try:
+            return get_mf_day_change(scheme_code)
+        except Exception as e:
+            logger.warning("Error fetching MF day change for %s: %s", scheme_code, e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(unique_codes))) as executor:
+        results = executor.map(_safe_day_change, unique_codes)
+        return dict(zip(unique_codes, results))
+
+
 def search_mf(query: str) -> Optional[list[dict]]:
     """
-    Search for mutual funds by name.
-    Note: MFApi.in doesn't provide a search endpoint,
-    so this would need to be implemented using mf_instruments data.
+    Search for mutual funds by name using MFApi's search endpoint.
 
-    For now, returns None. Can be enhanced later if needed.
+    Args:
+        query: Search terms (e.g., "PARAG PARIKH FLEXI CAP")
+
+    Returns:
+        List of matches with schemeCode and schemeName, or None if the request fails
     """
-    # TODO: Implement search using cached instruments list
-    return None
+    _rate_limit()
+
+    url = f"{MFAPI_BASE_URL}/mf/search"
+
+    try:
+        response = _session.get(url, params={"q": query}, timeout=10)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"Error searching MFApi for '{query}': {e}")
+        return None
@@ -8,29 +8,50 @@ Usage:
     peers = get_peer_comparison("RELIANCE")
 """
 
+import logging
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 import requests
 from bs4 import BeautifulSoup
 
-from config import SCREENER_BASE_URL, SCREENER_RATE_LIMIT_DELAY
+from config import SCREENER_BASE_URL, SCREENER_RATE_LIMIT_DELAY, SCREENER_MAX_WORKERS
 from storage.cache import get_cached, set_cached
 from models.stock import StockFundamentals
 
+logger = logging.getLogger(__name__)
 
-# Track last request time for rate limiting
-_last_request_time: float = 0
+# In-memory layer over the disk cache: symbol -> (expires_at, fundamentals).
+# Shared by all users; entries are re-validated against the disk cache hourly.
+FUNDAMENTALS_MEMORY_TTL_SECONDS = 3600
+_fundamentals_memo: dict[str, tuple[float, StockFundamentals]] = {}
+
+# Earliest time the next request may start (shared by all threads)
+_next_request_time: float = 0
+_rate_limit_lock = threading.Lock()
+
+# Shared HTTP session so page fetches reuse keep-alive TLS connections
+_session = requests.Session()
 
 
 def _rate_limit():
-    """Ensure we don't hit Screener.in too fast."""
-    global _last_request_time
-    elapsed = time.time() - _last_request_time
-    if elapsed < SCREENER_RATE_LIMIT_DELAY:
-        time.sleep(SCREENER_RATE_LIMIT_DELAY - elapsed)
-    _last_request_time = time.time()
+    """
+    Ensure we don't hit Screener.in too fast.
+    Safe to call from multiple threads: each caller reserves the next free
+    slot under the lock and sleeps outside it, so the process as a whole
+    stays within one request per SCREENER_RATE_LIMIT_DELAY.
+    """
+    global _next_request_time
+    with _rate_limit_lock:
+        now = time.monotonic()
+        start = max(now, _next_request_time)
+        _next_request_time = start + SCREENER_RATE_LIMIT_DELAY
+
+    if start > now:
+        time.sleep(start - now)
 
 
 def _get_page(symbol: str, max_retries: int = 3) -> Optional[BeautifulSoup]:
@@ -45,7 +66,7 @@ def _get_page(symbol: str, max_retries: int = 3) -> Optional[BeautifulSoup]:
     for attempt in range(max_retries):
         try:
             _rate_limit()
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _session.get(url, headers=headers, timeout=10)
             response.raise_for_status()
             return BeautifulSoup(response.text, "lxml")
         except requests.RequestException as e:
@@ -141,11 +162,17 @@ def get_stock_fundamentals(
     symbol = symbol.upper().strip()
     cache_key = symbol
 
-    # Check cache first
+    # Check in-memory cache, then disk cache
     if not force_refresh:
+        remembered = _recall_fundamentals(cache_key)
+        if remembered:
+            return remembered
+
         cached = get_cached("fundamentals", cache_key)
         if cached:
-            return StockFundamentals(**cached)
+            fundamentals = StockFundamentals(**cached)
+            _remember_fundamentals(cache_key, fundamentals)
+            return fundamentals
 
     # Fetch from Screener.in
     soup = _get_page(symbol)
@@ -329,10 +356,64 @@ def get_stock_fundamentals(
 
     # Cache the result
     set_cached("fundamentals", cache_key, fundamentals.model_dump(mode="json"))
+    _remember_fundamentals(cache_key, fundamentals)
 
     return fundamentals
 
 
+def get_stock_fundamentals_batch(symbols: list[str]) -> dict[str, Optional[StockFundamentals]]:
+    """
+    Get fundamentals for several stocks in one call.
+
+    Screener.in has no bulk endpoint, so symbols already in the memory or
+    disk cache are served directly and only the misses are scraped,
+    concurrently, over the shared session (still within the global rate limit).
+
+    Args:
+        symbols: Stock symbols (duplicates are fetched once)
+
+    Returns:
+        Dict mapping each symbol to its StockFundamentals, or None if it could not be fetched
+    """
+    unique_symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol]
+
+    def _safe_fundamentals(symbol: str) -> Optional[StockFundamentals]:
+        try:
+            return get_stock_fundamentals(symbol)
+        except Exception as e:
+            logger.warning("Failed to fetch fundamentals for %s: %s", symbol, e)
+            return None
+
+    results = {}
+    misses = []
+    for symbol in unique_symbols:
+        remembered = _recall_fundamentals(symbol.upper().strip())
+        if remembered:
+            results[symbol] = remembered
+        else:
+            misses.append(symbol)
+
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(SCREENER_MAX_WORKERS, len(misses))) as executor:
+            results.update(zip(misses, executor.map(_safe_fundamentals, misses)))
+
+    return results
+
+
+def _recall_fundamentals(cache_key: str) -> Optional[StockFundamentals]:
+    """Get fundamentals from the in-memory cache if present and not expired."""
+    memo = _fundamentals_memo.get(cache_key)
+    if memo and time.monotonic() < memo[0]:
+        return memo[1]
+    return None
+
+
+def _remember_fundamentals(cache_key: str, fundamentals: StockFundamentals) -> None:
+    """Keep fundamentals in memory so repeat lookups skip the disk cache."""
+    expires_at = time.monotonic() + FUNDAMENTALS_MEMORY_TTL_SECONDS
+    _fundamentals_memo[cache_key] = (expires_at, fundamentals)
+
+
 def get_peer_comparison(symbol: str) -> Optional[list[dict]]:
     """
     Get peer comparison data for a stock.
@@ -395,7 +476,7 @@ def search_stock(query: str) -> Optional[list[dict]]:
     }
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = _session.get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
         results = response.json()
 
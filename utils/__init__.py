@@ -1,14 +1,25 @@
 """InvestEz Utilities Package"""
 
-from utils.jwt_auth import create_token, decode_token, get_current_user_id, require_auth
+from utils.jwt_auth import (
+    create_token,
+    decode_token,
+    get_current_claims,
+    get_current_user_id,
+    require_auth,
+)
 from utils.crypto import encrypt_data, decrypt_data, generate_key
+from utils.cred_cache import get_cached_credential, set_cached_credential, invalidate_credentials
 
 __all__ = [
     "create_token",
     "decode_token",
+    "get_current_claims",
     "get_current_user_id",
     "require_auth",
     "encrypt_data",
     "decrypt_data",
     "generate_key",
+    "get_cached_credential",
+    "set_cached_credential",
+    "invalidate_credentials",
 ]
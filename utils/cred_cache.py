@@ -0,0 +1,74 @@
+"""
+In-process TTL cache for decrypted broker credentials and access tokens.
+
+Entries are keyed by (user_id, broker_id, kind) and must be invalidated
+whenever the matching broker_credentials row is written. The cache is
+per-process, so with multiple workers a write in one worker becomes
+visible to the others only after the TTL expires. Deploy with a single
+gunicorn worker (scale with threads) so logouts and credential changes
+take effect immediately.
+"""
+
+import threading
+import time
+from typing import Any, Optional
+
+# How long a decrypted value is reused before re-reading the database.
+# Kept short so a stale value in another worker process expires quickly.
+CREDENTIAL_CACHE_TTL_SECONDS = 30
+CREDENTIAL_CACHE_MAX_ENTRIES = 4096
+
+_cache: dict[tuple[int, str, str], tuple[float, Any]] = {}
+_lock = threading.Lock()
+
+
+def get_cached_credential(user_id: int, broker_id: str, kind: str) -> Optional[Any]:
+    """
+    Get a cached value if present and not expired.
+
+    Args:
+        user_id: User ID
+        broker_id: Broker identifier (kite, groww, etc.)
+        kind: What is cached, e.g. "credentials" or "access_token"
+
+    Returns:
+        Cached value or None on miss
+    """
+    key = (user_id, broker_id, kind)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del _cache[key]
+            return None
+        return value
+
+
+def set_cached_credential(user_id: int, broker_id: str, kind: str, value: Any) -> None:
+    """Cache a value for CREDENTIAL_CACHE_TTL_SECONDS."""
+    key = (user_id, broker_id, kind)
+    with _lock:
+        if key not in _cache and len(_cache) >= CREDENTIAL_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts keep insertion order)
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = (time.monotonic() + CREDENTIAL_CACHE_TTL_SECONDS, value)
+
+
+def invalidate_credentials(user_id: int, broker_id: Optional[str] = None) -> None:
+    """
+    Drop cached values for a user.
+
+    Args:
+        user_id: User ID
+        broker_id: Only drop entries for this broker. If None, drops all brokers.
+    """
+    with _lock:
+        stale = [
+            key for key in _cache
+            if key[0] == user_id and (broker_id is None or key[1] == broker_id)
+        ]
+        for key in stale:
+            del _cache[key]
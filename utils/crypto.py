@@ -1,9 +1,12 @@
 """
 Encryption utilities for sensitive data.
 Uses Fernet (symmetric encryption) from cryptography library.
+Fernet runs AES-128-CBC + HMAC-SHA256 through OpenSSL, which uses AES-NI
+where the CPU supports it.
 """
 
 import os
+from functools import lru_cache
 from cryptography.fernet import Fernet
 
 
@@ -29,6 +32,12 @@ def get_encryption_key() -> bytes:
         raise ValueError(f"Invalid DB_ENCRYPTION_KEY: {e}")
 
 
+@lru_cache(maxsize=1)
+def _get_fernet() -> Fernet:
+    """Build the Fernet instance once and reuse it for every encrypt/decrypt."""
+    return Fernet(get_encryption_key())
+
+
 def encrypt_data(plaintext: str) -> str:
     """
     Encrypt plaintext string and return base64-encoded ciphertext.
@@ -42,9 +51,7 @@ def encrypt_data(plaintext: str) -> str:
     if not plaintext:
         return ""
 
-    key = get_encryption_key()
-    f = Fernet(key)
-    encrypted = f.encrypt(plaintext.encode())
+    encrypted = _get_fernet().encrypt(plaintext.encode())
     return encrypted.decode()
 
 
@@ -61,9 +68,7 @@ def decrypt_data(ciphertext: str) -> str:
     if not ciphertext:
         return ""
 
-    key = get_encryption_key()
-    f = Fernet(key)
-    decrypted = f.decrypt(ciphertext.encode())
+    decrypted = _get_fernet().decrypt(ciphertext.encode())
     return decrypted.decode()
 
 
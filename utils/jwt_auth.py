@@ -2,13 +2,24 @@
 JWT authentication utilities.
 """
 
+import hashlib
 import os
+import threading
+import time
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import request, jsonify
+from flask import g, request, jsonify
 from typing import Optional, Callable, Any
 
+# Verified token payloads, keyed by sha256(token). Entries live for at most
+# JWT_CACHE_TTL_SECONDS and never past the token's own "exp" claim.
+JWT_CACHE_TTL_SECONDS = 60
+JWT_CACHE_MAX_ENTRIES = 10000
+
+_jwt_cache: dict[bytes, tuple[float, dict]] = {}
+_jwt_cache_lock = threading.Lock()
+
 
 def get_jwt_secret() -> str:
     """Get JWT secret from environment."""
@@ -40,6 +51,7 @@ def create_token(user_id: int, expires_in_days: int = 30) -> str:
 def decode_token(token: str) -> Optional[dict]:
     """
     Decode and verify a JWT token.
+    Recently verified tokens are served from an in-process cache.
 
     Args:
         token: JWT token string
@@ -47,23 +59,53 @@ def decode_token(token: str) -> Optional[dict]:
     Returns:
         Decoded payload dict or None if invalid
     """
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+
+    with _jwt_cache_lock:
+        entry = _jwt_cache.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if now < expires_at:
+                return payload
+            del _jwt_cache[key]
+
     try:
         payload = jwt.decode(token, get_jwt_secret(), algorithms=["HS256"])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    expires_at = now + JWT_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        expires_at = min(expires_at, payload["exp"])
 
-def get_current_user_id() -> Optional[int]:
+    with _jwt_cache_lock:
+        if key not in _jwt_cache and len(_jwt_cache) >= JWT_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts keep insertion order)
+            _jwt_cache.pop(next(iter(_jwt_cache)))
+        _jwt_cache[key] = (expires_at, payload)
+
+    return payload
+
+
+def get_current_claims() -> Optional[dict]:
     """
-    Get current user ID from JWT token in request.
-    Checks both Authorization header and session cookie.
+    Get the verified JWT payload for the current request.
+    Checks both Authorization header and session cookie. The token is only
+    decoded once per request; the result is cached on flask.g.
 
     Returns:
-        User ID or None if not authenticated
+        Decoded payload dict or None if not authenticated
     """
+    if "jwt_claims" not in g:
+        g.jwt_claims = _decode_request_token()
+    return g.jwt_claims
+
+
+def _decode_request_token() -> Optional[dict]:
+    """Read the JWT from the current request and decode it."""
     token = None
 
     # Check Authorization header
@@ -78,7 +120,17 @@ def get_current_user_id() -> Optional[int]:
     if not token:
         return None
 
-    payload = decode_token(token)
+    return decode_token(token)
+
+
+def get_current_user_id() -> Optional[int]:
+    """
+    Get current user ID from JWT token in request.
+
+    Returns:
+        User ID or None if not authenticated
+    """
+    payload = get_current_claims()
     if not payload:
         return None
 